@@ -0,0 +1,46 @@
+// Filters and aggregates the columnar match dataset off the main thread.
+//
+// The page posts {type: 'init', columns} once, where columns holds typed
+// arrays (year: Uint16Array, type: Uint8Array) plus the `types` table, then
+// {type: 'filter', requestId, year, typeCode} on every filter change. `year`
+// and `typeCode` are null for "all"; a typeCode of -1 matches nothing.
+// Each reply carries the matching row indices and the chart aggregates.
+
+let columns = null;
+
+self.onmessage = (event) => {
+    const message = event.data;
+
+    if (message.type === 'init') {
+        columns = message.columns;
+        return;
+    }
+
+    if (message.type === 'filter' && columns) {
+        const { requestId, year, typeCode } = message;
+        const years = columns.year;
+        const types = columns.type;
+        const count = columns.count;
+
+        const indices = new Uint32Array(count);
+        const typeCounts = new Uint32Array(columns.types.length);
+        const yearCounts = {};
+        let matched = 0;
+
+        for (let i = 0; i < count; i++) {
+            const yearMatch = year === null || years[i] === year;
+            const typeMatch = typeCode === null || types[i] === typeCode;
+
+            // Type chart follows the year filter, year chart follows the type filter
+            if (yearMatch) typeCounts[types[i]]++;
+            if (typeMatch) yearCounts[years[i]] = (yearCounts[years[i]] || 0) + 1;
+            if (yearMatch && typeMatch) indices[matched++] = i;
+        }
+
+        const result = indices.slice(0, matched);
+        self.postMessage(
+            { type: 'filtered', requestId, indices: result, typeCounts, yearCounts },
+            [result.buffer, typeCounts.buffer]
+        );
+    }
+};
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Match Dataset Analytics
+
+This script computes the statistics behind the page's charts and more (matches
+per year and type, opponent frequency, event streaks and gaps, PPV share over
+time) with grouped NumPy aggregations over the extracted dataset, and saves
+them as JSON the page can load instead of computing them client-side.
+"""
+
+import re
+import json
+import numpy as np
+from typing import List, Dict
+from datetime import date, datetime
+
+from verify_cena_matches_demo import (
+    CenaMatchVerifier, Match, extract_opponent_entities, parse_date_ordinal
+)
+
+
+def event_series(event: str) -> str:
+    """Return the recurring event an event name belongs to (e.g. "WrestleMania XXI" -> "WrestleMania")."""
+    series = re.sub(r'\b(\d+|[IVXLC]+)\b', '', event)
+    return ' '.join(series.split()) or event
+
+
+def _encode(values: List) -> tuple:
+    """Dictionary-encode values into (labels, integer codes)."""
+    labels, codes = np.unique(np.array(values, dtype=object), return_inverse=True)
+    return labels.tolist(), codes
+
+
+def _longest_runs(group_codes: np.ndarray, years: np.ndarray) -> tuple:
+    """Find the longest run of consecutive years per group.
+
+    Both arrays must be sorted by (group, year) with unique pairs. Returns
+    per-group arrays of run start year, run length and largest gap in years.
+    """
+    if not len(group_codes):
+        empty = np.zeros(0, dtype=int)
+        return empty, empty, empty
+
+    groups = group_codes.max() + 1
+    new_group = np.r_[True, group_codes[1:] != group_codes[:-1]]
+    breaks = new_group | np.r_[True, np.diff(years) != 1]
+
+    # Each run is a slice between consecutive breaks
+    run_starts = np.flatnonzero(breaks)
+    run_lengths = np.diff(np.r_[run_starts, len(years)])
+    run_groups = group_codes[run_starts]
+
+    # Keep the longest (earliest on ties) run per group
+    order = np.lexsort((run_starts, -run_lengths, run_groups))
+    first = np.r_[True, run_groups[order][1:] != run_groups[order][:-1]]
+    best = order[first]
+
+    longest_start = np.zeros(groups, dtype=int)
+    longest_length = np.zeros(groups, dtype=int)
+    longest_start[run_groups[best]] = years[run_starts[best]]
+    longest_length[run_groups[best]] = run_lengths[best]
+
+    gaps = np.where(new_group, 0, np.r_[0, np.diff(years)] - 1)
+    largest_gap = np.zeros(groups, dtype=int)
+    np.maximum.at(largest_gap, group_codes, gaps)
+
+    return longest_start, longest_length, largest_gap
+
+
+def compute_analytics(matches: List[Match], top_opponents: int = 20, top_gaps: int = 5) -> Dict:
+    """Compute grouped statistics over a match dataset."""
+    count = len(matches)
+    years = np.array([m.year for m in matches], dtype=int)
+    type_labels, type_codes = _encode([m.type for m in matches])
+    year_labels, year_codes = _encode([m.year for m in matches])
+
+    # Matches per (year, type) in one bincount; per-year and per-type totals are its marginals
+    per_year_type = np.bincount(
+        year_codes * len(type_labels) + type_codes,
+        minlength=len(year_labels) * len(type_labels)
+    ).reshape(len(year_labels), len(type_labels))
+    per_year = per_year_type.sum(axis=1)
+    per_type = per_year_type.sum(axis=0)
+
+    ppv_column = per_year_type[:, type_labels.index("PPV")] if "PPV" in type_labels else np.zeros(len(year_labels), dtype=int)
+    ppv_share = np.divide(ppv_column, per_year, out=np.zeros(len(year_labels)), where=per_year > 0)
+
+    # Opponent frequency over the exploded opponent entities
+    entities = [entity for m in matches for entity in extract_opponent_entities(m.opponent)]
+    opponent_labels, opponent_codes = _encode(entities)
+    opponent_counts = np.bincount(opponent_codes, minlength=len(opponent_labels))
+    # Labels are already sorted by name, so ties keep alphabetical order
+    opponent_order = np.argsort(-opponent_counts, kind='stable')
+
+    # Event streaks: unique (series, year) pairs sorted by series then year
+    series_labels, series_codes = _encode([event_series(m.event) for m in matches])
+    pairs = np.unique(np.stack([series_codes, years], axis=1), axis=0) if count else np.empty((0, 2), dtype=int)
+    appearances = np.bincount(pairs[:, 0], minlength=len(series_labels))
+    streak_start, streak_length, largest_gap = _longest_runs(pairs[:, 0], pairs[:, 1])
+    first_year = np.full(len(series_labels), np.iinfo(int).max)
+    last_year = np.zeros(len(series_labels), dtype=int)
+    np.minimum.at(first_year, pairs[:, 0], pairs[:, 1])
+    np.maximum.at(last_year, pairs[:, 0], pairs[:, 1])
+
+    # Longest gaps between consecutive dated matches
+    ordinals = np.array([o for o in (parse_date_ordinal(m.date) for m in matches) if o is not None], dtype=int)
+    ordinals.sort()
+    day_gaps = np.diff(ordinals)
+    gap_order = np.argsort(-day_gaps, kind='stable')[:top_gaps]
+
+    return {
+        'generated': datetime.now().isoformat(),
+        'total': count,
+        'years': [int(y) for y in year_labels],
+        'types': type_labels,
+        'matches_per_year': {str(y): int(n) for y, n in zip(year_labels, per_year)},
+        'matches_per_type': {t: int(n) for t, n in zip(type_labels, per_type)},
+        'matches_per_year_type': {
+            str(y): {t: int(n) for t, n in zip(type_labels, row)}
+            for y, row in zip(year_labels, per_year_type)
+        },
+        'ppv_share': {str(y): round(float(share), 4) for y, share in zip(year_labels, ppv_share)},
+        'top_opponents': [
+            {'name': opponent_labels[i], 'count': int(opponent_counts[i])}
+            for i in opponent_order[:top_opponents]
+        ],
+        'event_streaks': sorted([
+            {
+                'series': series_labels[i],
+                'appearances': int(appearances[i]),
+                'first_year': int(first_year[i]),
+                'last_year': int(last_year[i]),
+                'longest_streak': {
+                    'start': int(streak_start[i]),
+                    'end': int(streak_start[i] + streak_length[i] - 1),
+                    'length': int(streak_length[i])
+                },
+                'longest_gap_years': int(largest_gap[i])
+            }
+            for i in range(len(series_labels))
+        ], key=lambda s: (-s['longest_streak']['length'], -s['appearances'], s['series'])),
+        'longest_gaps': [
+            {
+                'from': date.fromordinal(int(ordinals[i])).isoformat(),
+                'to': date.fromordinal(int(ordinals[i + 1])).isoformat(),
+                'days': int(day_gaps[i])
+            }
+            for i in gap_order
+        ]
+    }
+
+
+def save_analytics(analytics: Dict, output_file: str = 'cena_match_analytics.json') -> None:
+    """Save precomputed analytics as JSON."""
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(analytics, f, indent=2, ensure_ascii=False)
+
+    print(f"📊 Analytics for {analytics['total']} matches saved to: {output_file}")
+
+
+def main():
+    """Main function to compute and save analytics."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Compute match statistics for the explorer page')
+    parser.add_argument('--html', default='index.html', help='Path to HTML file with existing match data')
+    parser.add_argument('--output', default='cena_match_analytics.json', help='Where to write the analytics JSON')
+    parser.add_argument('--top', type=int, default=20, help='Number of most frequent opponents to include')
+
+    args = parser.parse_args()
+
+    matches = CenaMatchVerifier().extract_existing_matches(args.html)
+    save_analytics(compute_analytics(matches, top_opponents=args.top), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Out-of-Core Match Verification
+
+This script verifies datasets too large to hold in memory, such as a complete
+historical archive. Both sides are normalized batch by batch and spilled to
+sorted runs on disk: existing matches by (year, date, input position), the
+order the matcher walks them in, and scraped matches by (year, input
+position), the order candidates are tried in. The runs are merged, a bounded
+number of files at a time, and joined year by year. Existing matches stream
+through the join; the scraped matches of one year are held in memory as
+candidates. The results are spooled to disk and streamed into the report
+writers.
+
+Memory is bounded by the run size while spilling and merging, and by the
+largest single year of scraped matches while joining.
+"""
+
+import os
+import json
+import heapq
+import tempfile
+from itertools import groupby
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from match_reports import REPORT_FORMATS, stream_report
+from verify_cena_matches_demo import CandidatePool, CenaMatchVerifier, Match, REPORT_FILES, normalize_rows
+
+
+DEFAULT_RUN_SIZE = 50000
+MERGE_FAN_IN = 64
+
+# Records are (year, date, input position, type, event, opponent)
+EXISTING_ORDER = itemgetter(0, 1, 2)
+SCRAPED_ORDER = itemgetter(0, 2)
+
+RecordKey = Callable[[tuple], tuple]
+
+
+def _write_records(records: Iterable[tuple], path: str) -> str:
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return path
+
+
+def spill_sorted_runs(matches: Iterable[Match], directory: str, prefix: str, order: RecordKey,
+                      run_size: int = DEFAULT_RUN_SIZE) -> Tuple[List[str], int]:
+    """Write matches to run files of at most `run_size` records each, sorted by `order`.
+
+    Records carry the match's position in the input, so both orders are
+    total. Returns the run paths and the number of matches spilled.
+    """
+    runs = []
+    buffer = []
+    count = 0
+    for match in matches:
+        buffer.append((match.year, match.date, count, match.type, match.event, match.opponent))
+        count += 1
+        if len(buffer) >= run_size:
+            buffer.sort(key=order)
+            runs.append(_write_records(buffer, os.path.join(directory, f"{prefix}-{len(runs):05d}.jsonl")))
+            buffer = []
+    if buffer:
+        buffer.sort(key=order)
+        runs.append(_write_records(buffer, os.path.join(directory, f"{prefix}-{len(runs):05d}.jsonl")))
+    return runs, count
+
+
+def _merge_files(paths: List[str], order: RecordKey) -> Iterator[tuple]:
+    files = [open(path, 'r', encoding='utf-8') for path in paths]
+    try:
+        yield from heapq.merge(*[(tuple(json.loads(line)) for line in f) for f in files], key=order)
+    finally:
+        for f in files:
+            f.close()
+
+
+def merge_runs(paths: List[str], order: RecordKey, fan_in: int = MERGE_FAN_IN) -> Iterator[tuple]:
+    """Merge sorted run files into one record stream sorted by `order`.
+
+    At most `fan_in` files are open at once: while there are more runs than
+    that, groups of `fan_in` runs are merged into longer runs next to them
+    first. Those intermediate runs are removed once merged further.
+    """
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2")
+
+    intermediate = set()
+    level = 0
+    try:
+        while len(paths) > fan_in:
+            merged = []
+            for start in range(0, len(paths), fan_in):
+                group = paths[start:start + fan_in]
+                directory, name = os.path.split(group[0])
+                merged.append(_write_records(_merge_files(group, order),
+                                             os.path.join(directory, f"merge{level}-{name}")))
+                intermediate.add(merged[-1])
+            for path in paths:
+                if path in intermediate:
+                    os.remove(path)
+                    intermediate.discard(path)
+            paths = merged
+            level += 1
+        yield from _merge_files(paths, order)
+    finally:
+        for path in intermediate:
+            os.remove(path)
+
+
+def _to_match(record: tuple) -> Match:
+    year, match_date, _, match_type, event, opponent = record
+    return Match(year, match_type, match_date, event, opponent)
+
+
+def sort_merge_join(verifier: CenaMatchVerifier, existing_runs: List[str], scraped_runs: List[str],
+                    fan_in: int = MERGE_FAN_IN) -> Iterator[Tuple[str, Match]]:
+    """Join the existing and scraped runs on year, yielding (result list, match) pairs.
+
+    Without a date window candidates never cross years, so classifying each
+    year on its own gives the same result as compare_matches on the whole
+    datasets. Each year's existing matches stream from the merged runs in
+    date order while its scraped matches are held in a CandidatePool. Both
+    sides are merged at the same time, so each gets half of `fan_in`.
+    """
+    if fan_in < 4:
+        raise ValueError("fan_in must be at least 4, two runs per side")
+    existing_groups = groupby(merge_runs(existing_runs, EXISTING_ORDER, fan_in // 2), key=itemgetter(0))
+    scraped_groups = groupby(merge_runs(scraped_runs, SCRAPED_ORDER, fan_in // 2), key=itemgetter(0))
+    existing = next(existing_groups, None)
+    scraped = next(scraped_groups, None)
+
+    while existing is not None or scraped is not None:
+        year = min(group[0] for group in (existing, scraped) if group is not None)
+        year_scraped = []
+        if scraped is not None and scraped[0] == year:
+            year_scraped = [_to_match(record) for record in scraped[1]]
+            scraped = next(scraped_groups, None)
+        pool = CandidatePool(year_scraped)
+
+        if existing is not None and existing[0] == year:
+            yield from verifier.iter_classified((_to_match(record) for record in existing[1]), pool)
+            existing = next(existing_groups, None)
+        for match in pool.remaining():
+            yield 'only_in_scraped', match
+
+
+class MatchSpool:
+    """Append-only list of matches kept in a JSON Lines file; iterating yields match dicts."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def append(self, match: Match) -> None:
+        self._file.write(json.dumps(match.to_dict(), ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def __iter__(self) -> Iterator[Dict]:
+        self._file.flush()
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def run_out_of_core_verification(verifier: CenaMatchVerifier, html_file_path: str = "index.html",
+                                 run_size: int = DEFAULT_RUN_SIZE, work_dir: Optional[str] = None,
+                                 output_dir: str = ".", fan_in: int = MERGE_FAN_IN) -> Optional[Dict[str, int]]:
+    """Verify out of core and write the verifier's report formats.
+
+    Memory use is bounded by `run_size` while spilling, by `fan_in` open runs
+    across both sides while merging, and by the largest single year of scraped
+    matches while joining. Returns the number of matches in each result list,
+    or None when no matches could be loaded from the source.
+    """
+    if verifier.date_window_days is not None:
+        raise ValueError("Out-of-core verification joins on year; date windows are not supported")
+    if fan_in < 4:
+        raise ValueError("fan_in must be at least 4, two runs per side")
+
+    print("🚀 Starting out-of-core John Cena PPV Match Verification")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory(prefix="cenalist-runs-", dir=work_dir) as tmp_dir:
+        print(f"📁 Spilling existing PPV matches from {html_file_path}...")
+        existing = (m for m in verifier.iter_existing_matches(html_file_path) if m.type == "PPV")
+        existing_runs, total_existing_ppv = spill_sorted_runs(existing, tmp_dir, "existing", EXISTING_ORDER, run_size)
+
+        source = verifier.build_source()
+        verifier.source_name = source.name
+        print(f"📂 Spilling matches from {source.name}...")
+        scraped = (m for batch in source.iter_batches() for m in normalize_rows(batch, default_type=source.default_type))
+        scraped_runs, total_scraped = spill_sorted_runs(scraped, tmp_dir, "scraped", SCRAPED_ORDER, run_size)
+        verifier.page_status = source.page_status
+
+        print(f"💾 {total_existing_ppv} existing PPV and {total_scraped} scraped matches in "
+              f"{len(existing_runs) + len(scraped_runs)} sorted runs")
+        if not total_scraped:
+            print("❌ No matches could be scraped. Verification cannot proceed.")
+            return None
+
+        spools = {name: MatchSpool(os.path.join(tmp_dir, f"{name}.jsonl"))
+                  for name in ('matched', 'only_in_existing', 'only_in_scraped')}
+        try:
+            print("🔍 Joining sorted runs year by year...")
+            for name, match in sort_merge_join(verifier, existing_runs, scraped_runs, fan_in):
+                spools[name].append(match)
+
+            counts = {name: spool.count for name, spool in spools.items()}
+            print(f"✅ Matched: {counts['matched']} PPV matches")
+            print(f"⚠️  Only in existing data: {counts['only_in_existing']} matches")
+            print(f"🆕 Only in scraped data: {counts['only_in_scraped']} matches")
+
+            overview = verifier.build_report_overview(total_existing_ppv, total_scraped, counts)
+            sections = {name: section.data for name, section in overview.items()}
+            sections.update({name: {'count': spool.count, 'matches': spool} for name, spool in spools.items()})
+
+            print("")
+            print("📄 Files generated:")
+            for format_name in verifier.report_formats:
+                output_file = os.path.join(output_dir, REPORT_FILES[format_name])
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    stream_report(sections, format_name, f)
+                print(f"  - {output_file}")
+        finally:
+            for spool in spools.values():
+                spool.close()
+
+    print("")
+    print("=" * 60)
+    print("VERIFICATION COMPLETE")
+    print("=" * 60)
+    return counts
+
+
+def main():
+    """Main function to run an out-of-core verification."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Verify very large match datasets out of core. Memory is bounded by --run-size while '
+                    'sorting and by the largest single year of scraped matches while joining.'
+    )
+    parser.add_argument('--html', default='index.html', help='Path to HTML file with existing match data')
+    parser.add_argument('--source', metavar='PATH', help='Verify against a local CSV/JSON Lines dump instead of ProFightDB')
+    parser.add_argument('--mock', action='store_true', help='Use mock data for demonstration')
+    parser.add_argument('--run-size', type=int, default=DEFAULT_RUN_SIZE, metavar='MATCHES',
+                        help='Matches per sorted run; bounds memory used while spilling')
+    parser.add_argument('--fan-in', type=int, default=MERGE_FAN_IN, metavar='RUNS',
+                        help='Most run files open at once, split evenly between the existing and scraped '
+                             'sides (at least 4); more runs take extra merge passes')
+    parser.add_argument('--work-dir', metavar='PATH', help='Directory for the temporary sorted runs')
+    parser.add_argument('--format', action='append', choices=sorted(REPORT_FORMATS), dest='formats',
+                        help='Report format to write (repeatable; default: markdown and json)')
+
+    args = parser.parse_args()
+    if args.fan_in < 4:
+        parser.error("--fan-in must be at least 4")
+
+    verifier = CenaMatchVerifier(use_mock_data=args.mock, source_path=args.source, report_formats=args.formats)
+    run_out_of_core_verification(verifier, args.html, run_size=args.run_size, work_dir=args.work_dir,
+                                 fan_in=args.fan_in)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+"""
+Verification Report Rendering
+
+The verifier builds a report model once per run: an ordered set of sections
+holding plain, JSON-serializable data. Each output format (Markdown, JSON, CSV,
+HTML) renders those sections in its own order, and rendered sections are cached
+under a hash of their input, so sections whose data did not change since the
+last run are not rendered again. Match-list sections are produced as streams
+of text chunks, so they can also be written straight to a file from on-disk
+data without being held in memory (see match_external.py).
+
+Batch and sharded runs have their own report models and formats
+(BATCH_REPORT_FORMATS, SHARD_REPORT_FORMATS), rendered the same way.
+"""
+
+import io
+import csv
+import json
+import html
+import hashlib
+from itertools import islice
+from typing import IO, Callable, Dict, Iterator, List, Optional, Tuple
+from datetime import datetime
+from dataclasses import dataclass, field
+
+
+MATCH_FIELDS = ['year', 'type', 'date', 'event', 'opponent']
+
+
+@dataclass
+class ReportSection:
+    """One section of the report model and the hash of its input data."""
+    name: str
+    data: Dict
+    input_hash: str = field(init=False)
+
+    def __post_init__(self):
+        payload = json.dumps([self.name, self.data], sort_keys=True, ensure_ascii=False)
+        self.input_hash = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class RenderCache:
+    """Rendered section text keyed by format, format version and section input hash.
+
+    `entries` can be a dictionary persisted elsewhere (the snapshot store keeps
+    one), which makes the cache survive between runs. `touch` is called with
+    the key of every entry a render uses, so the owner of `entries` can evict
+    the ones a run no longer needs.
+    """
+
+    def __init__(self, entries: Optional[Dict[str, str]] = None,
+                 touch: Optional[Callable[[str], None]] = None):
+        self.entries = entries if entries is not None else {}
+        self.touch = touch
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, report_format: 'ReportFormat', section: ReportSection) -> str:
+        key = f"{report_format.name}/{report_format.VERSION}/{section.input_hash}"
+        if self.touch is not None:
+            self.touch(key)
+        rendered = self.entries.get(key)
+        if rendered is not None:
+            self.hits += 1
+            return rendered
+
+        self.misses += 1
+        rendered = report_format.render_section(section)
+        self.entries[key] = rendered
+        return rendered
+
+
+class ReportFormat:
+    """Base class for output formats.
+
+    Subclasses list the sections they render in `SECTIONS` and implement
+    `render_<section>(data)` for each, or `stream_<section>(data)` yielding
+    text chunks for match lists, whose data has the `matches` and their
+    `count`. Non-empty sections are joined with `separator` between `prefix`
+    and `suffix`. Bump `VERSION` when the output changes so cached sections
+    rendered by the old code are not reused.
+    """
+
+    name = "base"
+    extension = ""
+    VERSION = 1
+    SECTIONS: List[str] = []
+    prefix = ""
+    separator = "\n"
+    suffix = ""
+
+    def stream_section(self, name: str, data: Dict) -> Iterator[str]:
+        stream = getattr(self, f"stream_{name}", None)
+        if stream is not None:
+            return stream(data)
+        return iter([getattr(self, f"render_{name}")(data)])
+
+    def render_section(self, section: ReportSection) -> str:
+        return "".join(self.stream_section(section.name, section.data))
+
+    def assemble(self, parts: List[str]) -> str:
+        return self.prefix + self.separator.join(parts) + self.suffix
+
+
+def _match_line(match: Dict) -> str:
+    return f"- **{match['date']}** - {match['event']} vs {match['opponent']}"
+
+
+def _recommendations(data: Dict) -> List[Tuple[str, str, str]]:
+    """(emoji, headline, detail) for each recommendation that applies to a summary."""
+    recommendations = []
+    if data['only_in_existing_count']:
+        recommendations.append(("🔍", "Review unmatched existing matches",
+                                "These might have different naming on ProFightDB or be missing from their database"))
+    if data['only_in_scraped_count']:
+        recommendations.append(("📝", "Consider adding new matches",
+                                "Update the existing dataset with matches found only on ProFightDB"))
+    if data['matched_count'] == data['total_existing_ppv']:
+        recommendations.append(("✅", "Perfect match", "All existing PPV matches were verified against ProFightDB!"))
+    else:
+        recommendations.append(("📊", f"{data['accuracy_rate']:.1f}% accuracy",
+                                "Consider investigating discrepancies for better data quality"))
+    return recommendations
+
+
+PRODUCTION_NOTES = [
+    "Ensure ProFightDB website is accessible",
+    "Review and adjust the scraping logic based on actual website structure",
+    "Implement rate limiting to be respectful to the website",
+    "Add more sophisticated fuzzy matching for event names and opponent names",
+]
+
+
+class MarkdownFormat(ReportFormat):
+    """The human-readable verification report."""
+
+    name = "markdown"
+    extension = "md"
+    SECTIONS = ['header', 'summary', 'source', 'only_in_existing', 'only_in_scraped', 'matched',
+                'recommendations', 'production_notes']
+
+    def render_header(self, data: Dict) -> str:
+        lines = [f"# {data['title']}"]
+        lines.append(f"Generated on: {datetime.fromisoformat(data['timestamp']).strftime('%Y-%m-%d %H:%M:%S')}")
+        if data['use_mock_data']:
+            lines.append("⚠️ **Note: This report uses mock data for demonstration purposes**")
+        lines.append("")
+        return "\n".join(lines)
+
+    def render_summary(self, data: Dict) -> str:
+        lines = ["## Summary"]
+        lines.append(f"- **Total PPV matches in existing data:** {data['total_existing_ppv']}")
+        lines.append(f"- **Total PPV matches scraped from ProFightDB:** {data['total_scraped']}")
+        lines.append(f"- **Matched matches:** {data['matched_count']}")
+        if data['total_existing_ppv'] > 0:
+            lines.append(f"- **Accuracy rate:** {data['accuracy_rate']:.1f}%")
+        lines.append("")
+        return "\n".join(lines)
+
+    def render_source(self, data: Dict) -> str:
+        lines = ["## Data Source Information"]
+        lines.append(f"- **Source:** {data['source']}")
+        lines.append(f"- **ProFightDB URL:** {data['source_url']}")
+        lines.append(f"- **Using mock data:** {'Yes' if data['use_mock_data'] else 'No'}")
+        for page in data['pages']:
+            detail = f"{page['match_count']} matches" if page['status'] == 'ok' else page['error']
+            lines.append(f"- **Page {page['url']}:** {page['status']} after {page['attempts']} attempt(s) ({detail})")
+        if data['snapshots']:
+            lines.append(f"- **Unchanged sources skipped:** {data['skipped_sources']} of {len(data['pages'])}")
+            lines.append(f"- **Comparisons reused from snapshots:** {data['reused_comparisons']}")
+        lines.append("")
+        return "\n".join(lines)
+
+    def stream_only_in_existing(self, data: Dict) -> Iterator[str]:
+        if not data['count']:
+            return
+        yield "## ⚠️ Matches in existing data but NOT found on ProFightDB\n"
+        yield "*These matches might be missing from ProFightDB or have different naming conventions.*\n\n"
+        for match in data['matches']:
+            yield _match_line(match) + "\n"
+
+    def stream_only_in_scraped(self, data: Dict) -> Iterator[str]:
+        if not data['count']:
+            return
+        yield "## 🆕 Matches found on ProFightDB but NOT in existing data\n"
+        yield "*These might be new matches that should be added to the existing dataset.*\n\n"
+        for match in data['matches']:
+            yield _match_line(match) + "\n"
+
+    def stream_matched(self, data: Dict) -> Iterator[str]:
+        if not data['count']:
+            return
+        yield "## ✅ Successfully matched PPV matches\n"
+        yield f"Found {data['count']} matches that appear in both datasets:\n\n"
+        for match in islice(data['matches'], 10):  # Show first 10
+            yield _match_line(match) + "\n"
+        if data['count'] > 10:
+            yield f"- ... and {data['count'] - 10} more matches\n"
+
+    def render_recommendations(self, data: Dict) -> str:
+        lines = ["## Recommendations"]
+        for emoji, headline, detail in _recommendations(data):
+            lines.append(f"- {emoji} **{headline}**: {detail}")
+        return "\n".join(lines)
+
+    def render_production_notes(self, data: Dict) -> str:
+        lines = [""]
+        lines.append("## For Production Use")
+        lines.extend(f"- {note}" for note in PRODUCTION_NOTES)
+        return "\n".join(lines)
+
+
+class JSONFormat(ReportFormat):
+    """The detailed comparison data, rendered key by key so sections cache independently."""
+
+    name = "json"
+    extension = "json"
+    SECTIONS = ['header', 'source', 'summary', 'matched', 'only_in_existing', 'only_in_scraped']
+    prefix = "{\n"
+    separator = ",\n"
+    suffix = "\n}"
+
+    @staticmethod
+    def _members(**members) -> str:
+        # Same layout as json.dump(..., indent=2) for members of the top-level object
+        return ",\n".join(
+            f"  {json.dumps(key)}: " + json.dumps(value, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+            for key, value in members.items()
+        )
+
+    @staticmethod
+    def _list_member(key: str, matches) -> Iterator[str]:
+        # Element by element, in the layout _members gives a list
+        yield f"  {json.dumps(key)}: ["
+        count = 0
+        for match in matches:
+            yield ("," if count else "") + "\n    " + json.dumps(match, indent=2, ensure_ascii=False).replace("\n", "\n    ")
+            count += 1
+        yield "\n  ]" if count else "]"
+
+    def render_header(self, data: Dict) -> str:
+        return self._members(timestamp=data['timestamp'], use_mock_data=data['use_mock_data'])
+
+    def render_source(self, data: Dict) -> str:
+        return self._members(source=data['source'], source_url=data['source_url'], pages=data['pages'],
+                             skipped_sources=data['skipped_sources'],
+                             reused_comparisons=data['reused_comparisons'])
+
+    def render_summary(self, data: Dict) -> str:
+        return self._members(summary={key: data[key] for key in (
+            'total_existing_ppv', 'total_scraped', 'matched_count', 'only_in_existing_count', 'only_in_scraped_count'
+        )})
+
+    def stream_matched(self, data: Dict) -> Iterator[str]:
+        return self._list_member('matched_matches', data['matches'])
+
+    def stream_only_in_existing(self, data: Dict) -> Iterator[str]:
+        return self._list_member('only_in_existing', data['matches'])
+
+    def stream_only_in_scraped(self, data: Dict) -> Iterator[str]:
+        return self._list_member('only_in_scraped', data['matches'])
+
+
+class CSVFormat(ReportFormat):
+    """One row per compared match, labelled with its comparison result."""
+
+    name = "csv"
+    extension = "csv"
+    SECTIONS = ['matched', 'only_in_existing', 'only_in_scraped']
+    prefix = ",".join(['result'] + MATCH_FIELDS) + "\n"
+    separator = ""
+
+    @staticmethod
+    def _rows(category: str, matches) -> Iterator[str]:
+        output = io.StringIO()
+        writer = csv.writer(output, lineterminator="\n")
+        for match in matches:
+            writer.writerow([category] + [match[key] for key in MATCH_FIELDS])
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
+
+    def stream_matched(self, data: Dict) -> Iterator[str]:
+        return self._rows('matched', data['matches'])
+
+    def stream_only_in_existing(self, data: Dict) -> Iterator[str]:
+        return self._rows('only_in_existing', data['matches'])
+
+    def stream_only_in_scraped(self, data: Dict) -> Iterator[str]:
+        return self._rows('only_in_scraped', data['matches'])
+
+
+class HTMLFormat(ReportFormat):
+    """A standalone HTML page with the same content as the Markdown report."""
+
+    name = "html"
+    extension = "html"
+    SECTIONS = ['header', 'summary', 'source', 'only_in_existing', 'only_in_scraped', 'matched',
+                'recommendations', 'production_notes']
+    suffix = "\n</body>\n</html>\n"
+
+    @staticmethod
+    def _match_table(title: str, data: Dict) -> Iterator[str]:
+        if not data['count']:
+            return
+        yield f"<h2>{title} ({data['count']})</h2>\n<table>\n"
+        yield "<tr>" + "".join(f"<th>{key.title()}</th>" for key in MATCH_FIELDS) + "</tr>\n"
+        for match in data['matches']:
+            yield "<tr>" + "".join(f"<td>{html.escape(str(match[key]))}</td>" for key in MATCH_FIELDS) + "</tr>\n"
+        yield "</table>"
+
+    def render_header(self, data: Dict) -> str:
+        title = html.escape(data['title'])
+        lines = ["<!DOCTYPE html>", "<html>", "<head>", '<meta charset="utf-8">', f"<title>{title}</title>",
+                 "</head>", "<body>", f"<h1>{title}</h1>",
+                 f"<p>Generated on: {datetime.fromisoformat(data['timestamp']).strftime('%Y-%m-%d %H:%M:%S')}</p>"]
+        if data['use_mock_data']:
+            lines.append("<p><strong>Note: This report uses mock data for demonstration purposes</strong></p>")
+        return "\n".join(lines)
+
+    def render_summary(self, data: Dict) -> str:
+        lines = ["<h2>Summary</h2>", "<ul>"]
+        lines.append(f"<li>Total PPV matches in existing data: {data['total_existing_ppv']}</li>")
+        lines.append(f"<li>Total PPV matches scraped: {data['total_scraped']}</li>")
+        lines.append(f"<li>Matched matches: {data['matched_count']}</li>")
+        if data['total_existing_ppv'] > 0:
+            lines.append(f"<li>Accuracy rate: {data['accuracy_rate']:.1f}%</li>")
+        lines.append("</ul>")
+        return "\n".join(lines)
+
+    def render_source(self, data: Dict) -> str:
+        lines = ["<h2>Data Source Information</h2>", "<ul>"]
+        lines.append(f"<li>Source: {html.escape(data['source'])}</li>")
+        lines.append(f"<li>ProFightDB URL: {html.escape(data['source_url'])}</li>")
+        lines.append(f"<li>Using mock data: {'Yes' if data['use_mock_data'] else 'No'}</li>")
+        for page in data['pages']:
+            detail = f"{page['match_count']} matches" if page['status'] == 'ok' else page['error']
+            lines.append(f"<li>Page {html.escape(page['url'])}: {page['status']} after {page['attempts']} "
+                         f"attempt(s) ({html.escape(str(detail))})</li>")
+        lines.append("</ul>")
+        return "\n".join(lines)
+
+    def stream_only_in_existing(self, data: Dict) -> Iterator[str]:
+        return self._match_table("Matches in existing data but NOT found on ProFightDB", data)
+
+    def stream_only_in_scraped(self, data: Dict) -> Iterator[str]:
+        return self._match_table("Matches found on ProFightDB but NOT in existing data", data)
+
+    def stream_matched(self, data: Dict) -> Iterator[str]:
+        return self._match_table("Successfully matched PPV matches", data)
+
+    def render_recommendations(self, data: Dict) -> str:
+        lines = ["<h2>Recommendations</h2>", "<ul>"]
+        for emoji, headline, detail in _recommendations(data):
+            lines.append(f"<li>{emoji} <strong>{html.escape(headline)}</strong>: {html.escape(detail)}</li>")
+        lines.append("</ul>")
+        return "\n".join(lines)
+
+    def render_production_notes(self, data: Dict) -> str:
+        lines = ["<h2>For Production Use</h2>", "<ul>"]
+        lines.extend(f"<li>{html.escape(note)}</li>" for note in PRODUCTION_NOTES)
+        lines.append("</ul>")
+        return "\n".join(lines)
+
+
+class BatchMarkdownFormat(MarkdownFormat):
+    """The consolidated batch report: a per-file breakdown and each dataset's discrepancies."""
+
+    name = "batch-markdown"
+    SECTIONS = ['header', 'summary', 'source', 'files', 'datasets']
+
+    def render_summary(self, data: Dict) -> str:
+        lines = ["## Summary"]
+        lines.append(f"- **Files verified:** {data['file_count']}")
+        lines.append(f"- **Distinct datasets:** {data['dataset_count']}")
+        lines.append(f"- **Files that failed to load:** {data['failed_count']}")
+        lines.append(f"- **Total PPV matches scraped from ProFightDB:** {data['total_scraped']}")
+        lines.append("")
+        return "\n".join(lines)
+
+    def render_files(self, data: Dict) -> str:
+        lines = ["## Per-file Breakdown"]
+        lines.append("| File | Dataset | PPV matches | Matched | Only in existing | Only in scraped | Accuracy |")
+        lines.append("|------|---------|-------------|---------|------------------|-----------------|----------|")
+        for entry in data['files']:
+            if entry['error']:
+                lines.append(f"| {entry['path']} | ❌ {entry['error']} | - | - | - | - | - |")
+                continue
+            summary = data['summaries'][entry['dataset_hash']]
+            accuracy_rate = (summary['matched_count'] / max(summary['total_existing_ppv'], 1)) * 100
+            label = entry['dataset_hash'][:12]
+            if entry['duplicate_of']:
+                label += f" (same as {entry['duplicate_of']})"
+            lines.append(
+                f"| {entry['path']} | {label} | {summary['total_existing_ppv']} | {summary['matched_count']} | "
+                f"{summary['only_in_existing_count']} | {summary['only_in_scraped_count']} | {accuracy_rate:.1f}% |"
+            )
+        lines.append("")
+        return "\n".join(lines)
+
+    def render_datasets(self, data: Dict) -> str:
+        lines = []
+        for content_hash, dataset in data['datasets'].items():
+            lines.append(f"## Dataset {content_hash[:12]}")
+            lines.append(f"*Files: {', '.join(dataset['files'])}*")
+            lines.append("")
+            if dataset['only_in_existing']:
+                lines.append(f"### ⚠️ {len(dataset['only_in_existing'])} matches NOT found on ProFightDB")
+                lines.extend(_match_line(match) for match in dataset['only_in_existing'])
+                lines.append("")
+            if dataset['only_in_scraped']:
+                lines.append(f"### 🆕 {len(dataset['only_in_scraped'])} matches found only on ProFightDB")
+                lines.extend(_match_line(match) for match in dataset['only_in_scraped'])
+                lines.append("")
+        return "\n".join(lines)
+
+
+class BatchJSONFormat(JSONFormat):
+    """The consolidated batch data: every file and each distinct dataset's discrepancies."""
+
+    name = "batch-json"
+    SECTIONS = ['header', 'source', 'summary', 'files', 'datasets']
+
+    def render_summary(self, data: Dict) -> str:
+        return self._members(total_scraped=data['total_scraped'])
+
+    def render_files(self, data: Dict) -> str:
+        return self._members(files=data['files'])
+
+    def render_datasets(self, data: Dict) -> str:
+        return self._members(datasets={
+            content_hash: {'files': dataset['files'], 'summary': data['summaries'][content_hash],
+                           'only_in_existing': dataset['only_in_existing'],
+                           'only_in_scraped': dataset['only_in_scraped']}
+            for content_hash, dataset in data['datasets'].items()
+        })
+
+
+class ShardMarkdownFormat(MarkdownFormat):
+    """The sharded verification report: one summary row and the discrepancies per wrestler."""
+
+    name = "shard-markdown"
+    SECTIONS = ['header', 'summary', 'wrestlers']
+
+    def render_summary(self, data: Dict) -> str:
+        lines = ["## Summary"]
+        lines.append("| Wrestler | Changed shards | Skipped shards | Matched | Only in existing | Only in scraped |")
+        lines.append("|----------|----------------|----------------|---------|------------------|-----------------|")
+        for row in data['wrestlers']:
+            if row['matched_count'] is None:
+                counts = "- | - | -"
+            else:
+                counts = f"{row['matched_count']} | {row['only_in_existing_count']} | {row['only_in_scraped_count']}"
+            lines.append(f"| {row['name']} | {row['changed_shards']} | {row['skipped_shards']} | {counts} |")
+        lines.append("")
+        return "\n".join(lines)
+
+    def render_wrestlers(self, data: Dict) -> str:
+        lines = []
+        for wrestler in data['wrestlers']:
+            lines.append(f"## {wrestler['name']}")
+            lines.append(f"*Shards: {', '.join(wrestler['changed_shards'])}*")
+            lines.append("")
+            for match in wrestler['only_in_existing']:
+                lines.append(f"- ⚠️ **{match['date']}** - {match['event']} vs {match['opponent']} (not found in source)")
+            for match in wrestler['only_in_scraped']:
+                lines.append(f"- 🆕 **{match['date']}** - {match['event']} vs {match['opponent']} (missing from dataset)")
+            lines.append("")
+        return "\n".join(lines)
+
+
+REPORT_FORMATS: Dict[str, ReportFormat] = {
+    report_format.name: report_format
+    for report_format in (MarkdownFormat(), JSONFormat(), CSVFormat(), HTMLFormat())
+}
+BATCH_REPORT_FORMATS: Dict[str, ReportFormat] = {'markdown': BatchMarkdownFormat(), 'json': BatchJSONFormat()}
+SHARD_REPORT_FORMATS: Dict[str, ReportFormat] = {'markdown': ShardMarkdownFormat()}
+
+
+def render_report(sections: Dict[str, ReportSection], format_name: str,
+                  cache: Optional[RenderCache] = None,
+                  formats: Optional[Dict[str, ReportFormat]] = None) -> str:
+    """Render the report model in one format, reusing cached sections.
+
+    `formats` picks the report family; by default the single-run report.
+    """
+    report_format = (formats if formats is not None else REPORT_FORMATS)[format_name]
+    cache = cache if cache is not None else RenderCache()
+    parts = []
+    for name in report_format.SECTIONS:
+        if name not in sections:
+            continue
+        rendered = cache.render(report_format, sections[name])
+        if rendered:
+            parts.append(rendered)
+    return report_format.assemble(parts)
+
+
+def stream_report(sections: Dict[str, Dict], format_name: str, output: IO[str]) -> None:
+    """Write a report in one format chunk by chunk, without caching.
+
+    `sections` maps section names to their data; match lists may be any
+    re-iterable (such as an on-disk spool) as long as `count` gives its length.
+    """
+    report_format = REPORT_FORMATS[format_name]
+    output.write(report_format.prefix)
+    written = False
+    for name in report_format.SECTIONS:
+        if name not in sections:
+            continue
+        started = False
+        for chunk in report_format.stream_section(name, sections[name]):
+            if not chunk:
+                continue
+            if not started:
+                if written:
+                    output.write(report_format.separator)
+                started = written = True
+            output.write(chunk)
+    output.write(report_format.suffix)
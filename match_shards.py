@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Per-Wrestler Sharded Dataset Build
+
+This script splits a multi-wrestler match dataset into gzip-compressed JSON
+shards, one per wrestler and year, and writes a manifest with the count and
+content hash of every shard. The verifier reads the manifest to verify only
+the shards that changed.
+"""
+
+import os
+import gzip
+import json
+import hashlib
+from typing import List, Dict, Optional
+from datetime import datetime
+
+from match_reports import SHARD_REPORT_FORMATS, ReportSection, render_report
+from verify_cena_matches_demo import (
+    CenaMatchVerifier, Match, FileDumpSource, normalize_rows, normalize_wrestler_name
+)
+
+
+MANIFEST_FILE = "manifest.json"
+DEFAULT_WRESTLER = "John Cena"
+
+
+def wrestler_slug(name: str) -> str:
+    """Return the directory-safe slug used for a wrestler's shards."""
+    return normalize_wrestler_name(name).replace(' ', '-')
+
+
+def load_wrestler_matches(paths: List[str], default_wrestler: str = DEFAULT_WRESTLER) -> Dict[str, List[Match]]:
+    """Load matches from HTML data pages and CSV/JSON dumps, grouped by wrestler.
+
+    Dump rows name their wrestler in a `wrestler` column; HTML pages and rows
+    without one belong to `default_wrestler`.
+    """
+    matches_by_wrestler: Dict[str, List[Match]] = {}
+
+    for path in paths:
+        if path.lower().endswith(('.html', '.htm')):
+            matches = CenaMatchVerifier().extract_existing_matches(path)
+            matches_by_wrestler.setdefault(default_wrestler, []).extend(matches)
+            continue
+
+        for batch in FileDumpSource(path).iter_batches():
+            rows_by_wrestler: Dict[str, List[Dict[str, str]]] = {}
+            for row in batch:
+                rows_by_wrestler.setdefault(row.get('wrestler') or default_wrestler, []).append(row)
+            for wrestler, rows in rows_by_wrestler.items():
+                matches_by_wrestler.setdefault(wrestler, []).extend(normalize_rows(rows, default_type="Unknown"))
+
+    return matches_by_wrestler
+
+
+def build_shards(matches_by_wrestler: Dict[str, List[Match]], output_dir: str,
+                 profightdb_urls: Optional[Dict[str, str]] = None) -> Dict:
+    """Write per-wrestler, per-year shards and their manifest; return the manifest."""
+    profightdb_urls = profightdb_urls or {}
+    manifest = {
+        'format': 'cenalist-shards',
+        'version': 1,
+        'generated': datetime.now().isoformat(),
+        'wrestlers': {}
+    }
+
+    for wrestler, matches in sorted(matches_by_wrestler.items()):
+        slug = wrestler_slug(wrestler)
+        by_year: Dict[int, List[Match]] = {}
+        for match in matches:
+            by_year.setdefault(match.year, []).append(match)
+
+        shards = []
+        for year, year_matches in sorted(by_year.items()):
+            payload = json.dumps([m.to_dict() for m in year_matches], ensure_ascii=False,
+                                 separators=(',', ':')).encode('utf-8')
+            relative_path = f"{slug}/{year}.json.gz"
+            shard_path = os.path.join(output_dir, slug, f"{year}.json.gz")
+            os.makedirs(os.path.dirname(shard_path), exist_ok=True)
+            with open(shard_path, 'wb') as f:
+                # Fixed mtime keeps unchanged shards byte-identical between builds
+                f.write(gzip.compress(payload, mtime=0))
+            shards.append({
+                'year': year,
+                'path': relative_path,
+                'count': len(year_matches),
+                'sha256': hashlib.sha256(payload).hexdigest()
+            })
+
+        manifest['wrestlers'][slug] = {
+            'name': wrestler,
+            'count': len(matches),
+            'profightdb_url': profightdb_urls.get(wrestler),
+            'shards': shards
+        }
+
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    total_shards = sum(len(info['shards']) for info in manifest['wrestlers'].values())
+    print(f"📦 Wrote {total_shards} shards for {len(manifest['wrestlers'])} wrestlers to {output_dir}")
+    return manifest
+
+
+def load_manifest(manifest_path: str) -> Dict:
+    """Load a shard manifest."""
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('format') != 'cenalist-shards':
+        raise ValueError(f"{manifest_path} is not a shard manifest")
+    return manifest
+
+
+def load_shard(base_dir: str, shard: Dict) -> List[Match]:
+    """Load the matches of one shard listed in a manifest."""
+    with gzip.open(os.path.join(base_dir, shard['path']), 'rt', encoding='utf-8') as f:
+        return [Match(**m) for m in json.load(f)]
+
+
+def verify_manifest(verifier: CenaMatchVerifier, manifest_path: str,
+                    wrestlers: Optional[List[str]] = None,
+                    sources: Optional[Dict[str, str]] = None) -> Dict[str, Dict]:
+    """Verify only the shards whose hash changed since they were last verified.
+
+    `sources` maps wrestler names to local CSV/JSON dumps to verify against
+    instead of their ProFightDB page; wrestlers without one use the
+    verifier's own source. Last-verified hashes live in the verifier's
+    snapshot store; without one, every shard counts as changed. Scraped matches from the years of skipped,
+    unchanged shards are left out so they don't show up as discrepancies;
+    scraped years with no shard at all are kept and reported.
+    """
+    manifest = load_manifest(manifest_path)
+    base_dir = os.path.dirname(manifest_path)
+    verified = verifier.snapshots.verified_shards if verifier.snapshots is not None else {}
+    selected = {wrestler_slug(w) for w in wrestlers} if wrestlers else None
+    source_paths = {wrestler_slug(name): path for name, path in (sources or {}).items()}
+    default_source_path = verifier.source_path
+
+    results = {}
+    for slug, info in manifest['wrestlers'].items():
+        if selected is not None and slug not in selected:
+            continue
+
+        changed = [shard for shard in info['shards'] if verified.get(shard['path']) != shard['sha256']]
+        result = {
+            'name': info['name'],
+            'changed_shards': [shard['path'] for shard in changed],
+            'skipped_shards': len(info['shards']) - len(changed),
+            'comparison': None,
+            'pages': []
+        }
+        results[slug] = result
+
+        if not changed:
+            print(f"♻️  {info['name']}: all {len(info['shards'])} shards unchanged, skipping")
+            continue
+
+        verifier.source_path = source_paths.get(slug, default_source_path)
+        if info.get('profightdb_url'):
+            verifier.profightdb_url = info['profightdb_url']
+            verifier.profightdb_pages = [info['profightdb_url']]
+        elif not (verifier.use_mock_data or verifier.source_path):
+            print(f"⚠️  {info['name']}: no ProFightDB URL in manifest, skipping {len(changed)} changed shards")
+            continue
+
+        print(f"🔁 {info['name']}: verifying {len(changed)} changed shards")
+        skipped_years = {shard['year'] for shard in info['shards'] if shard not in changed}
+        verifier.existing_matches = [m for shard in changed for m in load_shard(base_dir, shard)]
+        verifier.scraped_matches = [m for m in verifier.scrape_profightdb_matches() if m.year not in skipped_years]
+        result['comparison'] = verifier.compare_with_snapshots()
+        result['pages'] = [page.to_dict() for page in verifier.page_status]
+
+        # Only record shards as verified when every source page loaded
+        if verifier.snapshots is not None and all(page.ok for page in verifier.page_status):
+            for shard in changed:
+                verified[shard['path']] = shard['sha256']
+
+    verifier.source_path = default_source_path
+    return results
+
+
+def build_manifest_report_model(verifier: CenaMatchVerifier, results: Dict[str, Dict]) -> Dict[str, ReportSection]:
+    """Build the sharded verification report model, rendered by the formats in SHARD_REPORT_FORMATS."""
+    rows = []
+    wrestlers = []
+    for result in results.values():
+        comparison = result['comparison']
+        row = {'name': result['name'], 'changed_shards': len(result['changed_shards']),
+               'skipped_shards': result['skipped_shards'], 'matched_count': None,
+               'only_in_existing_count': None, 'only_in_scraped_count': None}
+        rows.append(row)
+        if comparison is None:
+            continue
+        row.update({'matched_count': len(comparison['matched']),
+                    'only_in_existing_count': len(comparison['only_in_existing']),
+                    'only_in_scraped_count': len(comparison['only_in_scraped'])})
+        if comparison['only_in_existing'] or comparison['only_in_scraped']:
+            wrestlers.append({
+                'name': result['name'],
+                'changed_shards': result['changed_shards'],
+                'only_in_existing': [m.to_dict() for m in comparison['only_in_existing']],
+                'only_in_scraped': [m.to_dict() for m in comparison['only_in_scraped']]
+            })
+
+    sections = [
+        ReportSection('header', {
+            'title': "Sharded Match Verification Report",
+            'timestamp': datetime.now().isoformat(),
+            'use_mock_data': verifier.use_mock_data
+        }),
+        ReportSection('summary', {'wrestlers': rows}),
+        ReportSection('wrestlers', {'wrestlers': wrestlers})
+    ]
+    return {section.name: section for section in sections}
+
+
+def generate_manifest_report(verifier: CenaMatchVerifier, results: Dict[str, Dict]) -> str:
+    """Generate a report of a sharded verification run."""
+    return render_report(build_manifest_report_model(verifier, results), 'markdown', verifier.render_cache,
+                         formats=SHARD_REPORT_FORMATS)
+
+
+def _parse_assignments(parser, items: List[str], option: str) -> Dict[str, str]:
+    """Parse repeatable NAME=VALUE options, reporting malformed ones as usage errors."""
+    assignments = {}
+    for item in items:
+        name, separator, value = item.partition('=')
+        if not separator or not name or not value:
+            parser.error(f"{option} expects NAME=VALUE, got {item!r}")
+        assignments[name] = value
+    return assignments
+
+
+def main():
+    """Main function to build or verify sharded datasets."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Build and verify per-wrestler sharded match datasets')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Shard HTML data pages and CSV/JSON dumps')
+    build_parser.add_argument('output_dir', help='Directory for the shards and manifest.json')
+    build_parser.add_argument('inputs', nargs='+', help='HTML data pages or CSV/JSON dumps with a wrestler column')
+    build_parser.add_argument('--wrestler', default=DEFAULT_WRESTLER, help='Wrestler for HTML pages and rows without one')
+    build_parser.add_argument('--profightdb', action='append', default=[], metavar='NAME=URL',
+                              help='ProFightDB page for a wrestler (repeatable)')
+
+    verify_parser = subparsers.add_parser('verify', help='Verify the shards that changed since the last run')
+    verify_parser.add_argument('manifest', help='Path to manifest.json')
+    verify_parser.add_argument('--wrestler', action='append', help='Only verify these wrestlers (repeatable)')
+    verify_parser.add_argument('--source', action='append', default=[], metavar='NAME=PATH',
+                               help="Verify a wrestler against a local CSV/JSON dump instead of ProFightDB (repeatable)")
+    verify_parser.add_argument('--mock', action='store_true',
+                               help="Verify every wrestler against John Cena's mock data, for demonstration")
+    verify_parser.add_argument('--fetch-deadline', type=float, default=60.0, metavar='SECONDS',
+                               help='Time budget for fetching each wrestler\'s ProFightDB pages')
+    verify_parser.add_argument('--snapshots', metavar='PATH', help='Snapshot file recording which shards were verified')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        urls = _parse_assignments(build_parser, args.profightdb, '--profightdb')
+        urls.setdefault(DEFAULT_WRESTLER, CenaMatchVerifier().profightdb_url)
+        build_shards(load_wrestler_matches(args.inputs, args.wrestler), args.output_dir, urls)
+        return
+
+    sources = _parse_assignments(verify_parser, args.source, '--source')
+    verifier = CenaMatchVerifier(use_mock_data=args.mock, snapshot_path=args.snapshots,
+                                 fetch_deadline=args.fetch_deadline)
+    results = verify_manifest(verifier, args.manifest, args.wrestler, sources)
+
+    report_file = "cena_match_shard_report.md"
+    with open(report_file, 'w', encoding='utf-8') as f:
+        f.write(generate_manifest_report(verifier, results))
+    if verifier.snapshots is not None:
+        verifier.snapshots.save()
+
+    print(f"📄 Sharded verification report saved to: {report_file}")
+
+
+if __name__ == "__main__":
+    main()
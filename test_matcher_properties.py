@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Differential and scale regression tests for the match comparison.
+
+Random datasets with realistic perturbations (shifted dates, renamed events,
+opponent aliases, dropped and extra matches) are compared through every
+optimized path (including the out-of-core join) and checked against a frozen
+copy of the original compare_matches. The intended changes since then (date
+ordered results, the optional date window) are explicit exceptions with their
+own tests, and the matcher has to stay well ahead of the original scan so
+speed regressions fail the suite.
+"""
+
+import io
+import os
+import re
+import json
+import time
+import random
+import tempfile
+import contextlib
+from datetime import date, timedelta
+
+from verify_cena_matches_demo import (
+    CenaMatchVerifier, Match, parse_date_ordinal
+)
+from match_external import run_out_of_core_verification
+
+SEEDS = [1, 7, 42, 2024]
+DATE_WINDOWS = [0, 2, 5]
+
+# Seconds allowed for one compare_matches call, by date window (None is the
+# year-based default) and number of existing matches: a few times the measured
+# 0.003s / 0.015s / 0.03s without a window and 0.002s / 0.006s / 0.026s with one
+TIME_BUDGETS = {
+    None: {300: 0.015, 1000: 0.06, 3000: 0.15},
+    3: {300: 0.01, 1000: 0.03, 3000: 0.12},
+}
+# At the largest size (smaller ones are too quick to time reliably), each mode
+# must take at most this fraction of the original scan's time; both measure
+# about 10%, and rescanning every candidate for repeated events takes 30%
+BASELINE_TIME_RATIO = 0.2
+
+EVENTS = [
+    "WrestleMania {n}", "WrestleMania {roman}", "Royal Rumble", "SummerSlam", "Summer Slam",
+    "Survivor Series", "Backlash", "Night of Champions", "Money in the Bank", "Hell in a Cell",
+    "TLC", "Elimination Chamber", "No Way Out", "Judgment Day", "Vengeance", "Great American Bash",
+]
+OPPONENTS = [
+    "Edge", "Randy Orton", "JBL", "John 'Bradshaw' Layfield", "Triple H", "Kurt Angle",
+    "Jesús", "Jesus", "Big Show", "The Big Show", "Umaga (Last Man Standing Match)",
+    "Teamed with Batista vs. Edge & Chris Jericho", "Participated in Royal Rumble Match",
+    "Teamed with Shawn Michaels vs. Randy Orton & Edge", "CM Punk (Hell in a Cell Match)",
+]
+ROMAN = {20: "XX", 21: "XXI", 22: "XXII", 23: "XXIII", 24: "XXIV", 25: "XXV"}
+
+
+def random_matches(rng: random.Random, count: int) -> list:
+    """Generate a random dataset in the shape of the page data."""
+    matches = []
+    for _ in range(count):
+        year = rng.randint(2003, 2023)
+        match_date = date(year, 1, 1) + timedelta(days=rng.randint(0, 364))
+        number = year - 1984
+        event = rng.choice(EVENTS).format(n=number, roman=ROMAN.get(number, str(number)))
+        matches.append(Match(year, rng.choice(["PPV", "PPV", "Raw", "SmackDown"]), match_date.isoformat(),
+                             event, rng.choice(OPPONENTS)))
+    return matches
+
+
+def perturb(rng: random.Random, matches: list) -> list:
+    """Derive a 'scraped' dataset: drop, shift, rename, alias, duplicate and add matches."""
+    scraped = []
+    for match in matches:
+        if match.type != "PPV" or rng.random() < 0.2:
+            continue
+        shifted = date.fromisoformat(match.date) + timedelta(days=rng.randint(-4, 4))
+        event = match.event
+        roll = rng.random()
+        if roll < 0.15:
+            event = event.upper()
+        elif roll < 0.25:
+            event = f"{event} {shifted.year}"
+        elif roll < 0.3:
+            event = event.replace("WrestleMania", "WM")
+        scraped.append(Match(shifted.year, "PPV", shifted.isoformat(), event, rng.choice(OPPONENTS)))
+        if rng.random() < 0.05:
+            scraped.append(Match(**scraped[-1].to_dict()))
+    scraped.extend(m for m in random_matches(rng, len(matches) // 10) if m.type == "PPV")
+    rng.shuffle(scraped)
+    return scraped
+
+
+def baseline_fuzzy_match_events(event1: str, event2: str) -> bool:
+    """Frozen copy of the original fuzzy_match_events; do not update it with the matcher."""
+    # Normalize the event names
+    norm1 = re.sub(r'[^\w\s]', '', event1.lower().strip())
+    norm2 = re.sub(r'[^\w\s]', '', event2.lower().strip())
+
+    # Direct match
+    if norm1 == norm2:
+        return True
+
+    # Check for common variations
+    variations = {
+        'wrestlemania': ['wrestlemania', 'wm'],
+        'royal rumble': ['royal rumble', 'rumble'],
+        'summerslam': ['summerslam', 'summer slam'],
+        'survivor series': ['survivor series', 'ss'],
+    }
+
+    for canonical, variants in variations.items():
+        if any(v in norm1 for v in variants) and any(v in norm2 for v in variants):
+            return True
+
+    # Check if one contains the other (for cases like "WrestleMania 21" vs "WrestleMania XXI")
+    return norm1 in norm2 or norm2 in norm1
+
+
+def baseline_compare(existing_matches: list, scraped_matches: list) -> dict:
+    """Frozen copy of the original O(n·m) compare_matches, without its progress output.
+
+    This is the behavior every optimized path must reproduce. Do not update it
+    with the matcher; intended changes are separate, separately tested
+    exceptions (see in_date_order and window_compare).
+    """
+    # Filter existing matches to only PPV events
+    existing_ppv = [m for m in existing_matches if m.type == "PPV"]
+
+    # Perform fuzzy matching
+    matched = []
+    only_in_existing = []
+    only_in_scraped = list(scraped_matches)  # Start with all scraped matches
+
+    for existing_match in existing_ppv:
+        found_match = False
+        for scraped_match in scraped_matches[:]:  # Use slice to allow modification during iteration
+            if (existing_match.year == scraped_match.year and
+                    baseline_fuzzy_match_events(existing_match.event, scraped_match.event)):
+                matched.append(existing_match)
+                if scraped_match in only_in_scraped:
+                    only_in_scraped.remove(scraped_match)
+                found_match = True
+                break
+
+        if not found_match:
+            only_in_existing.append(existing_match)
+
+    return {
+        'matched': matched,
+        'only_in_existing': only_in_existing,
+        'only_in_scraped': only_in_scraped
+    }
+
+
+def in_date_order(comparison: dict) -> dict:
+    """Intended change 1: compare_matches returns every list stably sorted by date."""
+    return {key: sorted(matches, key=lambda m: m.date) for key, matches in comparison.items()}
+
+
+def window_compare(existing_matches: list, scraped_matches: list, window: int) -> dict:
+    """Intended change 2: the baseline loop with --date-window candidates.
+
+    Only the candidate test differs from baseline_compare: a scraped match is a
+    candidate when its date is within ±window days, and undated matches on
+    either side fall back to the baseline same-year test.
+    """
+    existing_ppv = [m for m in existing_matches if m.type == "PPV"]
+
+    matched = []
+    only_in_existing = []
+    only_in_scraped = list(scraped_matches)
+
+    for existing_match in existing_ppv:
+        ordinal = parse_date_ordinal(existing_match.date)
+        for scraped_match in scraped_matches:
+            scraped_ordinal = parse_date_ordinal(scraped_match.date)
+            if ordinal is None or scraped_ordinal is None:
+                is_candidate = existing_match.year == scraped_match.year
+            else:
+                is_candidate = abs(scraped_ordinal - ordinal) <= window
+            if is_candidate and baseline_fuzzy_match_events(existing_match.event, scraped_match.event):
+                matched.append(existing_match)
+                if scraped_match in only_in_scraped:
+                    only_in_scraped.remove(scraped_match)
+                break
+        else:
+            only_in_existing.append(existing_match)
+
+    return {
+        'matched': matched,
+        'only_in_existing': only_in_existing,
+        'only_in_scraped': only_in_scraped
+    }
+
+
+def as_dicts(comparison: dict) -> dict:
+    """Exact, field-by-field view of a comparison (Match equality is deliberately loose)."""
+    return {key: [m.to_dict() for m in comparison[key]] for key in ('matched', 'only_in_existing', 'only_in_scraped')}
+
+
+def quiet(function, *args, **kwargs):
+    """Run a verifier call without its progress output."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args, **kwargs)
+
+
+def write_data_page(path: str, matches: list) -> None:
+    """Write matches as an HTML data page in the format of index.html."""
+    lines = [
+        f'            {{ year: {m.year}, type: "{m.type}", date: "{m.date}", event: "{m.event}", opponent: "{m.opponent}" }},'
+        for m in matches
+    ]
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("<html><script>\n        const allMatches = [\n" + "\n".join(lines) + "\n        ];\n</script></html>\n")
+
+
+def test_indexed_matcher_matches_baseline():
+    """Indexed compare_matches must classify exactly like the original matcher"""
+    print("🧪 Testing indexed matcher against the original matcher...")
+
+    for seed in SEEDS:
+        rng = random.Random(seed)
+        existing = random_matches(rng, 400)
+        scraped = perturb(rng, existing)
+
+        verifier = CenaMatchVerifier()
+        verifier.existing_matches = existing
+        verifier.scraped_matches = scraped
+
+        expected = as_dicts(in_date_order(baseline_compare(existing, scraped)))
+        actual = as_dicts(quiet(verifier.compare_matches))
+        assert actual == expected, f"Seed {seed}: indexed matcher diverged from the original matcher"
+
+        print(f"✅ Seed {seed}: {len(existing)} existing vs {len(scraped)} scraped agree")
+
+
+def test_date_order_exception():
+    """Date ordering only reorders the original matcher's result lists"""
+    print("🧪 Testing the date order exception...")
+
+    rng = random.Random(5)
+    existing = random_matches(rng, 400)
+    scraped = perturb(rng, existing)
+    verifier = CenaMatchVerifier()
+    verifier.existing_matches = existing
+    verifier.scraped_matches = scraped
+
+    baseline = as_dicts(baseline_compare(existing, scraped))
+    actual = as_dicts(quiet(verifier.compare_matches))
+    by_fields = lambda m: tuple(m.values())
+    for key in baseline:
+        assert sorted(actual[key], key=by_fields) == sorted(baseline[key], key=by_fields), \
+            f"{key} holds different matches than the original matcher"
+        dates = [m['date'] for m in actual[key]]
+        assert dates == sorted(dates), f"{key} is not in date order"
+
+    print("✅ Results hold the original matches, in date order")
+
+
+def test_date_window_exception():
+    """--date-window changes only which scraped matches are candidates"""
+    print("🧪 Testing the date window exception...")
+
+    for seed in SEEDS:
+        rng = random.Random(seed)
+        existing = random_matches(rng, 400)
+        scraped = perturb(rng, existing)
+
+        for window in DATE_WINDOWS:
+            verifier = CenaMatchVerifier(date_window_days=window)
+            verifier.existing_matches = existing
+            verifier.scraped_matches = scraped
+
+            expected = as_dicts(in_date_order(window_compare(existing, scraped, window)))
+            actual = as_dicts(quiet(verifier.compare_matches))
+            assert actual == expected, f"Seed {seed}, window {window}: windowed matcher diverged"
+
+        print(f"✅ Seed {seed}: windowed matcher agrees for windows {DATE_WINDOWS}")
+
+    # Undated matches fall back to the original same-year candidates
+    undated_existing = [Match(m.year, m.type, "", m.event, m.opponent) for m in existing]
+    undated_scraped = [Match(m.year, m.type, "", m.event, m.opponent) for m in scraped]
+    assert as_dicts(window_compare(undated_existing, undated_scraped, 2)) == \
+        as_dicts(baseline_compare(undated_existing, undated_scraped))
+    print("✅ Undated matches use the original same-year rule")
+
+
+def test_batch_and_snapshot_paths_match_baseline():
+    """Parallel batch verification and snapshot reuse must return the same classification"""
+    print("🧪 Testing batch and snapshot paths...")
+
+    rng = random.Random(99)
+    datasets = [random_matches(rng, 300) for _ in range(2)]
+    scraped = perturb(rng, datasets[0])
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dump_path = os.path.join(tmp_dir, "scraped.json")
+        with open(dump_path, 'w', encoding='utf-8') as f:
+            json.dump([m.to_dict() for m in scraped], f, ensure_ascii=False)
+
+        paths = []
+        for i, matches in enumerate(datasets + [datasets[0]]):
+            paths.append(os.path.join(tmp_dir, f"page_{i}.html"))
+            write_data_page(paths[-1], matches)
+
+        snapshot_path = os.path.join(tmp_dir, "snapshots.json")
+        verifier = CenaMatchVerifier(source_path=dump_path, snapshot_path=snapshot_path)
+        batch = quiet(verifier.verify_batch, paths, max_workers=2)
+        assert len(batch['datasets']) == 2, "Duplicate page should share a dataset"
+        quiet(verifier.snapshots.save)
+
+        for entry in batch['files']:
+            matches = batch['datasets'][entry['dataset_hash']]['matches']
+            expected = as_dicts(in_date_order(baseline_compare(matches, scraped)))
+            assert as_dicts(batch['datasets'][entry['dataset_hash']]['comparison']) == expected, \
+                f"Batch result for {entry['path']} diverged from the original matcher"
+
+            # A fresh verifier reuses the stored comparison; it must round-trip exactly
+            cached = CenaMatchVerifier(source_path=dump_path, snapshot_path=snapshot_path)
+            cached.existing_matches = matches
+            cached.scraped_matches = quiet(cached.scrape_profightdb_matches)
+            assert as_dicts(quiet(cached.compare_with_snapshots)) == expected
+            assert cached.reused_comparisons == 1, "Unchanged datasets should come from the snapshot"
+
+    print("✅ Batch and snapshot paths agree with the original matcher")
+
+
+def test_out_of_core_matches_baseline():
+    """The sort-merge join over spilled runs must classify like the original matcher"""
+    print("🧪 Testing out-of-core verification...")
+
+    for seed in SEEDS:
+        rng = random.Random(seed)
+        existing = random_matches(rng, 400)
+        scraped = perturb(rng, existing)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            html_path = os.path.join(tmp_dir, "page.html")
+            write_data_page(html_path, existing)
+            dump_path = os.path.join(tmp_dir, "scraped.jsonl")
+            with open(dump_path, 'w', encoding='utf-8') as f:
+                f.writelines(json.dumps(m.to_dict(), ensure_ascii=False) + "\n" for m in scraped)
+
+            verifier = CenaMatchVerifier(source_path=dump_path, report_formats=['json'])
+            counts = quiet(run_out_of_core_verification, verifier, html_path, run_size=37, output_dir=tmp_dir,
+                           fan_in=4)
+            with open(os.path.join(tmp_dir, "cena_match_comparison_data.json"), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+        expected = as_dicts(in_date_order(baseline_compare(existing, scraped)))
+        actual = {'matched': data['matched_matches'], 'only_in_existing': data['only_in_existing'],
+                  'only_in_scraped': data['only_in_scraped']}
+        assert actual == expected, f"Seed {seed}: out-of-core join diverged from the original matcher"
+        assert counts == {key: len(matches) for key, matches in expected.items()}
+
+        print(f"✅ Seed {seed}: out-of-core join agrees with the original matcher")
+
+
+def best_time(function, *args, repeat: int = 5) -> float:
+    """Fastest of `repeat` runs, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        quiet(function, *args)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def test_comparison_time_budgets():
+    """compare_matches must stay within its budgets and well ahead of the original scan, with and without a window"""
+    print("🧪 Testing comparison time budgets...")
+
+    for window, budgets in TIME_BUDGETS.items():
+        mode = "year-based" if window is None else f"{window}-day window"
+        for size, budget in sorted(budgets.items()):
+            rng = random.Random(size)
+            verifier = CenaMatchVerifier(date_window_days=window)
+            verifier.existing_matches = random_matches(rng, size)
+            verifier.scraped_matches = perturb(rng, verifier.existing_matches)
+
+            elapsed = best_time(verifier.compare_matches)
+            assert elapsed <= budget, f"{mode}: {size} matches took {elapsed:.3f}s (budget {budget:.3f}s)"
+            print(f"✅ {mode}: {size} existing / {len(verifier.scraped_matches)} scraped in {elapsed:.3f}s "
+                  f"(budget {budget}s)")
+
+        baseline = best_time(baseline_compare, verifier.existing_matches, verifier.scraped_matches)
+        assert elapsed <= baseline * BASELINE_TIME_RATIO, \
+            f"{mode}: {size} matches took {elapsed:.3f}s, the original scan {baseline:.3f}s"
+        print(f"✅ {mode}: {elapsed / baseline:.0%} of the original scan's {baseline:.3f}s at {size} matches")
+
+
+def main():
+    """Run all tests"""
+    print("🚀 Running Match Comparison Regression Tests")
+    print("=" * 60)
+
+    try:
+        test_indexed_matcher_matches_baseline()
+        test_date_order_exception()
+        test_date_window_exception()
+        test_batch_and_snapshot_paths_match_baseline()
+        test_out_of_core_matches_baseline()
+        test_comparison_time_budgets()
+
+        print("")
+        print("=" * 60)
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,76 @@
 Test script for John Cena match verification functionality.
 """
 
+import io
 import os
+import sys
 import json
-from verify_cena_matches_demo import CenaMatchVerifier, Match
+import contextlib
+import base64
+import tempfile
+import requests
+from array import array
+from verify_cena_matches_demo import (
+    CenaMatchVerifier, Match, ResilientFetcher, CircuitBreaker,
+    FileDumpSource, MockSource, SnapshotStore, dataset_fingerprint, expand_html_inputs, export_worker_dataset,
+    extract_opponent_entities, extract_profightdb_rows
+)
+from match_analytics import compute_analytics
+from match_reports import RenderCache, render_report
+from match_external import EXISTING_ORDER, merge_runs, run_out_of_core_verification, spill_sorted_runs
+from match_shards import (
+    build_shards, generate_manifest_report, load_manifest, load_shard, load_wrestler_matches, verify_manifest,
+    main as match_shards_main
+)
+
+
+class FakeResponse:
+    """Minimal stand-in for a streamed requests.Response.
+    
+    With a clock, every chunk read advances it by `chunk_delay` seconds.
+    """
+    def __init__(self, status_code=200, content=b'', chunks=1, clock=None, chunk_delay=0.0):
+        self.status_code = status_code
+        self.content = content
+        self.chunks = chunks
+        self.clock = clock
+        self.chunk_delay = chunk_delay
+    
+    def iter_content(self, chunk_size=1):
+        size = max(1, -(-len(self.content) // self.chunks))
+        for start in range(0, len(self.content), size):
+            if self.clock is not None:
+                self.clock.now += self.chunk_delay
+            yield self.content[start:start + size]
+    
+    def close(self):
+        pass
+
+
+class FakeSession:
+    """Session replaying scripted responses or exceptions per URL."""
+    def __init__(self, script):
+        self.script = {url: list(outcomes) for url, outcomes in script.items()}
+        self.calls = []
+    
+    def get(self, url, headers=None, timeout=None, stream=False):
+        self.calls.append((url, timeout))
+        outcome = self.script[url].pop(0) if len(self.script[url]) > 1 else self.script[url][0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class FakeClock:
+    """Clock advanced only by the fetcher's sleeps."""
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.now += seconds
 
 def test_match_extraction():
     """Test extraction of matches from index.html"""
@@ -25,6 +92,23 @@ def test_match_extraction():
     print(f"✅ Extracted {len(matches)} total matches, {len(ppv_matches)} PPV matches")
     return matches
 
+def test_match_extraction_without_dataset():
+    """Test that pages without an allMatches array are rejected"""
+    print("🧪 Testing extraction from pages without match data...")
+    
+    verifier = CenaMatchVerifier()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, content in [("empty.html", ""), ("no_data.html", "<html><script>const other = [];</script></html>")]:
+            path = os.path.join(tmp_dir, name)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            try:
+                verifier.extract_existing_matches(path)
+            except ValueError:
+                print(f"✅ {name} rejected")
+            else:
+                raise AssertionError(f"{name} should raise ValueError")
+
 def test_fuzzy_matching():
     """Test fuzzy event matching functionality"""
     print("🧪 Testing fuzzy event matching...")
@@ -116,6 +200,548 @@ def test_json_export():
     print("✅ JSON export test passed")
     print(f"   Summary: {data['summary']}")
 
+def test_batch_verification():
+    """Test batch verification across the bundled data pages"""
+    print("🧪 Testing batch verification...")
+    
+    paths = expand_html_inputs(["index*.html", "index.html"])
+    assert paths == ["index.html", "index_improved.html", "index_prettified.html"], f"Unexpected inputs: {paths}"
+    
+    verifier = CenaMatchVerifier(use_mock_data=True)
+    batch = verifier.verify_batch(paths, max_workers=2)
+    
+    # The three bundled pages embed the same dataset
+    assert len(batch['files']) == 3, "Should report every input file"
+    assert len(batch['datasets']) == 1, "Identical datasets should be de-duplicated"
+    assert batch['files'][0]['duplicate_of'] is None
+    assert batch['files'][1]['duplicate_of'] == "index.html"
+    
+    report = verifier.generate_batch_report(batch)
+    assert "## Per-file Breakdown" in report and "## Data Source Information" in report
+    for path in paths:
+        assert f"| {path} |" in report, f"Missing per-file row for {path}"
+
+    # A page without match data is reported and the rest of the batch still runs
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bad_path = os.path.join(tmp_dir, "bad.html")
+        with open(bad_path, 'w', encoding='utf-8') as f:
+            f.write("<html><body>No data here</body></html>")
+
+        batch = verifier.verify_batch(["index.html", bad_path, "index_improved.html"], max_workers=2)
+        errors = {entry['path']: entry['error'] for entry in batch['files']}
+        assert errors["index.html"] is None and errors["index_improved.html"] is None
+        assert bad_path in errors[bad_path], f"Error should name the failing page: {errors[bad_path]}"
+        assert len(batch['datasets']) == 1
+        assert f"| {bad_path} | ❌" in verifier.generate_batch_report(batch)
+
+    print("✅ Batch verification test passed")
+
+def test_opponent_index():
+    """Test opponent tokenization, alias resolution and head-to-head lookups"""
+    print("🧪 Testing opponent entity index...")
+    
+    test_cases = [
+        ("Teamed with The FBI vs. Chris Benoit, Rhyno & Spanky", ["Chris Benoit", "Rhyno", "Spanky"]),
+        ("John 'Bradshaw' Layfield", ["JBL"]),
+        ("JBL (First Blood Match)", ["JBL"]),
+        ("Jesus", ["Jesús"]),
+        ("Elimination Chamber Match; then vs. Edge", ["Edge"]),
+        ("Participated in Royal Rumble Match", []),
+    ]
+    
+    for opponent, expected in test_cases:
+        result = extract_opponent_entities(opponent)
+        assert result == expected, f"Expected {expected} for '{opponent}', got {result}"
+        print(f"✅ '{opponent}' -> {result}")
+    
+    verifier = CenaMatchVerifier()
+    verifier.existing_matches = verifier.extract_existing_matches("index.html")
+    
+    jbl_matches = verifier.head_to_head("John 'Bradshaw' Layfield")
+    assert jbl_matches, "Should find matches against JBL"
+    assert jbl_matches == verifier.head_to_head("JBL"), "Aliases should resolve to the same matches"
+    assert all("JBL" in m.opponents for m in jbl_matches)
+    
+    # A match appended in place must show up without replacing the list
+    rematch = Match(2030, "PPV", "2030-04-06", "WrestleMania 46", "JBL")
+    verifier.existing_matches.append(rematch)
+    assert verifier.head_to_head("JBL") == jbl_matches + [rematch]
+
+    # The opponent index must not change which scraped match is consumed
+    verifier.existing_matches = [Match(2005, "PPV", "2005-04-03", "WrestleMania 21", "JBL")]
+    verifier.scraped_matches = [
+        Match(2005, "PPV", "2005-04-03", "WrestleMania XXI", "Edge"),
+        Match(2005, "PPV", "2005-04-03", "WrestleMania 21", "JBL"),
+    ]
+    comparison = verifier.compare_matches()
+    assert comparison['only_in_scraped'] == [verifier.scraped_matches[1]], \
+        "Candidates should be tried in scraped order, not shared-opponent first"
+
+    print("✅ Opponent index test passed")
+
+def test_date_window_matching():
+    """Test bisect-based date window matching and date-ordered results"""
+    print("🧪 Testing date window matching...")
+    
+    existing = [
+        Match(2009, "PPV", "2009-04-05", "WrestleMania 25", "Edge & The Big Show"),
+        Match(2008, "PPV", "2008-03-30", "WrestleMania XXIV", "Randy Orton & Triple H"),
+        Match(2008, "PPV", "2008-12-31", "Armageddon", "Chris Jericho"),
+    ]
+    scraped = [
+        Match(2009, "PPV", "2009-01-01", "Armageddon", "Chris Jericho"),
+        Match(2008, "PPV", "2008-03-28", "WrestleMania XXIV", "Randy Orton & Triple H"),
+    ]
+    
+    for window, expected_matched in [(None, 1), (0, 0), (1, 1), (2, 2)]:
+        verifier = CenaMatchVerifier(date_window_days=window)
+        verifier.existing_matches = existing
+        verifier.scraped_matches = scraped
+        comparison = verifier.compare_matches()
+        assert len(comparison['matched']) == expected_matched, f"Window {window}: expected {expected_matched} matched"
+        for key in ('matched', 'only_in_existing', 'only_in_scraped'):
+            dates = [m.date for m in comparison[key]]
+            assert dates == sorted(dates), f"{key} should be in date order"
+        print(f"✅ Window {window} -> {len(comparison['matched'])} matched")
+    
+    print("✅ Date window matching test passed")
+
+def test_resilient_fetching():
+    """Test retry/backoff, circuit breaking and deadlines in the fetch layer"""
+    print("🧪 Testing resilient fetching...")
+    
+    page = b"<table><tr><th>Date</th></tr><tr><td>2005-04-03</td><td>WrestleMania 21</td><td>JBL</td></tr></table>"
+    
+    # Transient failures are retried with exponential backoff
+    clock = FakeClock()
+    session = FakeSession({"http://a.test/1": [requests.ConnectionError("boom"), FakeResponse(503), FakeResponse(200, page)]})
+    fetcher = ResilientFetcher(session=session, clock=clock, sleep=clock.sleep)
+    result = fetcher.fetch("http://a.test/1", deadline=100)
+    assert result.ok and result.attempts == 3, f"Unexpected result: {result}"
+    assert clock.now == 3.0, "Should back off 1s then 2s"
+    print(f"✅ Retried to success after {result.attempts} attempts")
+    
+    # Client errors are not retried
+    session = FakeSession({"http://a.test/404": [FakeResponse(404)]})
+    result = ResilientFetcher(session=session, clock=clock, sleep=clock.sleep).fetch("http://a.test/404")
+    assert result.status == 'http_error' and result.attempts == 1
+    
+    # Missing pages do not count against the host's circuit
+    clock = FakeClock()
+    session = FakeSession({"http://e.test/missing": [FakeResponse(404)], "http://e.test/ok": [FakeResponse(200, page)]})
+    fetcher = ResilientFetcher(session=session, clock=clock, sleep=clock.sleep)
+    for _ in range(5):
+        assert fetcher.fetch("http://e.test/missing").status == 'http_error'
+    assert fetcher.fetch("http://e.test/ok").ok, "404s should not open the circuit"
+    
+    # Repeated failures open the host's circuit
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=30, clock=clock)
+    session = FakeSession({"http://b.test/1": [requests.Timeout("slow")], "http://b.test/2": [FakeResponse(200, page)]})
+    fetcher = ResilientFetcher(session=session, max_attempts=2, circuit_breaker=breaker, clock=clock, sleep=clock.sleep)
+    assert fetcher.fetch("http://b.test/1").status == 'network_error'
+    assert fetcher.fetch("http://b.test/2").status == 'circuit_open', "Open circuit should fail fast"
+    clock.now += 30
+    assert fetcher.fetch("http://b.test/2").ok, "Circuit should close again after the cooldown"
+    print("✅ Circuit breaker opened and recovered")
+    
+    # Partial results keep per-page status instead of falling back to mock data
+    clock = FakeClock()
+    session = FakeSession({"http://c.test/ok": [FakeResponse(200, page)], "http://d.test/down": [requests.ConnectionError("down")]})
+    verifier = CenaMatchVerifier(fetch_deadline=5, fetcher=ResilientFetcher(session=session, clock=clock, sleep=clock.sleep))
+    verifier.profightdb_pages = ["http://c.test/ok", "http://d.test/down"]
+    matches = verifier.scrape_profightdb_matches()
+    assert len(matches) == 1 and not verifier.use_mock_data
+    assert [p.status for p in verifier.page_status] == ['ok', 'deadline_exceeded']
+    assert verifier.page_status[1].error, "Deadline failures should say why"
+    assert clock.now <= 5, "Fetching should stop at the deadline"
+    
+    # A slow-drip body is abandoned at the deadline instead of read to the end
+    clock = FakeClock()
+    session = FakeSession({"http://f.test/slow": [FakeResponse(200, page, chunks=10, clock=clock, chunk_delay=1.0)]})
+    result = ResilientFetcher(session=session, clock=clock, sleep=clock.sleep).fetch("http://f.test/slow", deadline=3)
+    assert result.status == 'deadline_exceeded' and result.error and clock.now <= 4, f"Unexpected result: {result}"
+    
+    # A deadline that has already passed still reports an error message
+    result = ResilientFetcher(session=session, clock=clock, sleep=clock.sleep).fetch("http://f.test/slow", deadline=0)
+    assert result.status == 'deadline_exceeded' and result.error == "Deadline exceeded before the first attempt"
+    print("✅ Partial results returned with per-page status")
+    
+    print("✅ Resilient fetching test passed")
+
+def test_source_adapters():
+    """Test that every source adapter feeds the same normalization pipeline"""
+    print("🧪 Testing source adapters...")
+    
+    verifier = CenaMatchVerifier()
+    expected = verifier.get_mock_profightdb_data()
+    assert MockSource(verifier.get_mock_profightdb_data).load() == expected
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_path = os.path.join(tmp_dir, "dump.json")
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump({'matches': [m.to_dict() for m in expected]}, f)
+        
+        csv_path = os.path.join(tmp_dir, "dump.csv")
+        with open(csv_path, 'w', encoding='utf-8') as f:
+            f.write("date,event,opponent\n")
+            f.write("April 3 2005,WrestleMania 21,JBL\n")
+            f.write(",Missing Date,Nobody\n")
+        
+        assert FileDumpSource(json_path, batch_size=4).load() == expected
+        assert [m.to_dict() for m in FileDumpSource(csv_path).load()] == [
+            {'year': 2005, 'type': 'PPV', 'date': '2005-04-03', 'event': 'WrestleMania 21', 'opponent': 'JBL'}
+        ]
+        
+        verifier = CenaMatchVerifier(source_path=json_path)
+        verifier.existing_matches = verifier.extract_existing_matches("index.html")
+        verifier.scraped_matches = verifier.scrape_profightdb_matches()
+        assert len(verifier.compare_matches()['matched']) == 8
+    
+    page = b"<table><tr><th>Date</th><th>Event</th><th>Opponent</th></tr><tr><td>2005-04-03</td><td>WrestleMania 21</td><td>JBL</td></tr></table>"
+    assert extract_profightdb_rows(page) == [{'date': '2005-04-03', 'event': 'WrestleMania 21', 'opponent': 'JBL'}]
+    
+    print("✅ Source adapter test passed")
+
+def test_change_detection_snapshots():
+    """Test that unchanged pages and datasets are reused from snapshots"""
+    print("🧪 Testing change-detection snapshots...")
+    
+    page = b"<table><tr><th>Date</th></tr><tr><td>2005-04-03</td><td>WrestleMania 21</td><td>JBL</td></tr></table>"
+    changed_page = page.replace(b"</table>", b"<tr><td>2006-04-02</td><td>WrestleMania 22</td><td>Triple H</td></tr></table>")
+    
+    def run(content, snapshot_path):
+        clock = FakeClock()
+        session = FakeSession({"http://e.test/ppv": [FakeResponse(200, content)]})
+        verifier = CenaMatchVerifier(
+            fetcher=ResilientFetcher(session=session, clock=clock, sleep=clock.sleep),
+            snapshot_path=snapshot_path
+        )
+        verifier.profightdb_pages = ["http://e.test/ppv"]
+        verifier.existing_matches = verifier.extract_existing_matches("index.html")
+        verifier.scraped_matches = verifier.scrape_profightdb_matches()
+        comparison = verifier.compare_with_snapshots()
+        verifier.snapshots.save()
+        return verifier, comparison
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        snapshot_path = os.path.join(tmp_dir, "snapshots.json")
+        
+        first, first_comparison = run(page, snapshot_path)
+        assert first.skipped_sources == 0 and first.reused_comparisons == 0
+        
+        second, second_comparison = run(page, snapshot_path)
+        assert second.skipped_sources == 1, "Unchanged page should not be re-parsed"
+        assert second.reused_comparisons == 1, "Unchanged datasets should reuse the comparison"
+        assert second_comparison == first_comparison
+        assert "Unchanged sources skipped:** 1 of 1" in second.generate_report(second_comparison)
+        
+        third, third_comparison = run(changed_page, snapshot_path)
+        assert third.skipped_sources == 0 and third.reused_comparisons == 0
+        assert len(third.scraped_matches) == 2
+        with open(snapshot_path, 'r', encoding='utf-8') as f:
+            assert len(json.load(f)['comparisons']) == 1, "Comparisons from earlier runs should be pruned"
+        
+        # A matcher change invalidates stored comparisons
+        CenaMatchVerifier.MATCHER_VERSION += 1
+        try:
+            fourth, _ = run(changed_page, snapshot_path)
+        finally:
+            CenaMatchVerifier.MATCHER_VERSION -= 1
+        assert fourth.skipped_sources == 1 and fourth.reused_comparisons == 0
+        
+        # A page that fails to load keeps its stored rows for the next run
+        snapshot_path = os.path.join(tmp_dir, "two_pages.json")
+        urls = ["http://e.test/ppv", "http://e.test/ppv2"]
+        for second_page in (FakeResponse(200, changed_page), FakeResponse(503, b""), FakeResponse(200, changed_page)):
+            clock = FakeClock()
+            session = FakeSession({urls[0]: [FakeResponse(200, page)], urls[1]: [second_page]})
+            verifier = CenaMatchVerifier(
+                fetcher=ResilientFetcher(session=session, clock=clock, sleep=clock.sleep),
+                snapshot_path=snapshot_path
+            )
+            verifier.profightdb_pages = urls
+            verifier.scrape_profightdb_matches()
+            verifier.snapshots.save()
+        assert verifier.skipped_sources == 2, "Rows stored before the failed run should still be reused"
+    
+    print("✅ Change-detection snapshot test passed")
+
+def test_worker_dataset_export():
+    """Test the columnar typed-array export used by the page's Web Worker"""
+    print("🧪 Testing worker dataset export...")
+    
+    verifier = CenaMatchVerifier()
+    matches = verifier.extract_existing_matches("index.html")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_file = os.path.join(tmp_dir, "worker.json")
+        export_worker_dataset(matches, output_file)
+        with open(output_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    
+    assert data['format'] == 'cenalist-columns' and data['count'] == len(matches)
+    assert data['fingerprint'] == dataset_fingerprint(matches)
+    
+    # The page recomputes the fingerprint in JavaScript; this value comes from index.html's datasetFingerprint
+    sample = [Match(2005, "PPV", "2005-04-03", "WrestleMania 21", "JBL"),
+              Match(2004, "PPV", "2004-05-16", "Judgment Day", "René Duprée")]
+    assert dataset_fingerprint(sample) == "9076e960"
+    
+    # Pick typecodes by size, as the exporter does; 'I' is not 4 bytes everywhere
+    typecodes = {dtype: next(code for code in 'BHILQ' if array(code).itemsize == size)
+                 for dtype, size in (('uint8', 1), ('uint16', 2), ('uint32', 4))}
+    columns = {}
+    for name, column in data['columns'].items():
+        columns[name] = array(typecodes[column['dtype']], base64.b64decode(column['data']))
+        assert len(columns[name]) == len(matches), f"Column {name} has the wrong length"
+    
+    # Decoding the columns gives back the original records
+    for i in (0, len(matches) // 2, len(matches) - 1):
+        decoded = Match(
+            year=columns['year'][i],
+            type=data['types'][columns['type'][i]],
+            date=data['strings'][columns['date'][i]],
+            event=data['strings'][columns['event'][i]],
+            opponent=data['strings'][columns['opponent'][i]]
+        )
+        assert decoded.to_dict() == matches[i].to_dict()
+    
+    # A Uint8Array type column holds codes 0-255, so exactly 256 types fit
+    many_types = [Match(2005, f"Type {i}", "2005-01-01", "Event", "Opponent") for i in range(257)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_file = os.path.join(tmp_dir, "worker.json")
+        export_worker_dataset(many_types[:256], output_file)
+        with open(output_file, 'r', encoding='utf-8') as f:
+            assert len(json.load(f)['types']) == 256
+        try:
+            export_worker_dataset(many_types, output_file)
+            assert False, "257 match types should not fit a Uint8Array"
+        except ValueError:
+            pass
+    
+    print("✅ Worker dataset export test passed")
+
+def test_sharded_build():
+    """Test per-wrestler sharding, the manifest and shard-level change detection"""
+    print("🧪 Testing sharded dataset build...")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dump_path = os.path.join(tmp_dir, "edge.json")
+        with open(dump_path, 'w', encoding='utf-8') as f:
+            json.dump([
+                {'wrestler': 'Edge', 'date': '2005-06-26', 'type': 'PPV', 'event': 'Vengeance', 'opponent': 'Kane'},
+                {'wrestler': 'Edge', 'date': '2006-01-08', 'type': 'PPV', 'event': "New Year's Revolution", 'opponent': 'John Cena'},
+            ], f)
+        
+        output_dir = os.path.join(tmp_dir, "shards")
+        matches_by_wrestler = load_wrestler_matches(["index.html", dump_path])
+        manifest = build_shards(matches_by_wrestler, output_dir)
+        
+        cena = manifest['wrestlers']['john-cena']
+        assert cena['count'] == len(matches_by_wrestler['John Cena'])
+        assert sum(shard['count'] for shard in cena['shards']) == cena['count']
+        assert [shard['year'] for shard in manifest['wrestlers']['edge']['shards']] == [2005, 2006]
+        
+        manifest_path = os.path.join(output_dir, "manifest.json")
+        assert load_manifest(manifest_path)['wrestlers'].keys() == manifest['wrestlers'].keys()
+        shard = cena['shards'][0]
+        assert load_shard(output_dir, shard) == [m for m in matches_by_wrestler['John Cena'] if m.year == shard['year']]
+        
+        # Rebuilding unchanged data keeps shard hashes stable
+        assert build_shards(matches_by_wrestler, output_dir)['wrestlers'] == manifest['wrestlers']
+        
+        snapshot_path = os.path.join(tmp_dir, "snapshots.json")
+        verifier = CenaMatchVerifier(use_mock_data=True, snapshot_path=snapshot_path)
+        results = verify_manifest(verifier, manifest_path, wrestlers=["John Cena"])
+        assert list(results) == ['john-cena']
+        assert len(results['john-cena']['changed_shards']) == len(cena['shards'])
+        assert len(results['john-cena']['comparison']['matched']) == 8
+        assert "| John Cena | " in generate_manifest_report(verifier, results)
+        verifier.snapshots.save()
+        
+        # Only the shard whose content changed is verified again
+        matches_by_wrestler['John Cena'].append(Match(2010, "PPV", "2010-12-19", "TLC", "Wade Barrett"))
+        build_shards(matches_by_wrestler, output_dir)
+        verifier = CenaMatchVerifier(use_mock_data=True, snapshot_path=snapshot_path)
+        results = verify_manifest(verifier, manifest_path, wrestlers=["John Cena"])
+        assert results['john-cena']['changed_shards'] == ["john-cena/2010.json.gz"]
+        assert results['john-cena']['skipped_shards'] == len(cena['shards']) - 1
+        
+        # Scraped years without a shard are reported; only skipped shards' years are left out
+        source_path = os.path.join(tmp_dir, "edge_source.json")
+        with open(source_path, 'w', encoding='utf-8') as f:
+            json.dump([
+                {'date': '2005-06-26', 'type': 'PPV', 'event': 'Vengeance', 'opponent': 'Kane'},
+                {'date': '2006-01-08', 'type': 'PPV', 'event': "New Year's Revolution", 'opponent': 'John Cena'},
+                {'date': '2007-02-18', 'type': 'PPV', 'event': 'No Way Out', 'opponent': 'John Cena'},
+            ], f)
+        verifier = CenaMatchVerifier(source_path=source_path, snapshot_path=snapshot_path)
+        comparison = verify_manifest(verifier, manifest_path, wrestlers=["Edge"])['edge']['comparison']
+        assert len(comparison['matched']) == 2
+        assert [m.year for m in comparison['only_in_scraped']] == [2007]
+        verifier.snapshots.save()
+        
+        matches_by_wrestler['Edge'].append(Match(2006, "PPV", "2006-04-02", "WrestleMania 22", "Mick Foley"))
+        build_shards(matches_by_wrestler, output_dir)
+        # Per-wrestler dumps stand in for ProFightDB pages
+        verifier = CenaMatchVerifier(snapshot_path=snapshot_path)
+        result = verify_manifest(verifier, manifest_path, wrestlers=["Edge"], sources={"Edge": source_path})['edge']
+        assert result['changed_shards'] == ["edge/2006.json.gz"]
+        assert [m.year for m in result['comparison']['matched']] == [2006]
+        assert [m.year for m in result['comparison']['only_in_scraped']] == [2007]
+        assert verifier.source_path is None
+        
+        # Malformed NAME=VALUE options are usage errors
+        argv = sys.argv
+        try:
+            sys.argv = ["match_shards.py", "build", output_dir, dump_path, "--profightdb", "Edge"]
+            with contextlib.redirect_stderr(io.StringIO()):
+                match_shards_main()
+            assert False, "--profightdb without '=' should be rejected"
+        except SystemExit as e:
+            assert e.code == 2
+        finally:
+            sys.argv = argv
+    
+    print("✅ Sharded dataset build test passed")
+
+def test_match_analytics():
+    """Test grouped analytics against straightforward Python counts"""
+    print("🧪 Testing match analytics...")
+    
+    verifier = CenaMatchVerifier()
+    matches = verifier.extract_existing_matches("index.html")
+    verifier.existing_matches = matches
+    analytics = compute_analytics(matches)
+    
+    assert analytics['total'] == len(matches)
+    for match_type in {m.type for m in matches}:
+        assert analytics['matches_per_type'][match_type] == len([m for m in matches if m.type == match_type])
+    for year in {m.year for m in matches}:
+        year_matches = [m for m in matches if m.year == year]
+        assert analytics['matches_per_year'][str(year)] == len(year_matches)
+        ppv_share = len([m for m in year_matches if m.type == "PPV"]) / len(year_matches)
+        assert abs(analytics['ppv_share'][str(year)] - ppv_share) < 1e-4
+    
+    top = analytics['top_opponents'][0]
+    assert top['count'] == len(verifier.head_to_head(top['name'])), "Opponent counts should agree with the opponent index"
+    
+    # Streaks and gaps on a small synthetic series
+    series = [
+        Match(year, "PPV", f"{year}-04-01", name, "Opponent")
+        for year, name in [(2004, "WrestleMania XX"), (2005, "WrestleMania 21"), (2006, "WrestleMania 22"), (2009, "WrestleMania 25")]
+    ]
+    streaks = compute_analytics(series)['event_streaks']
+    assert streaks == [{
+        'series': 'WrestleMania', 'appearances': 4, 'first_year': 2004, 'last_year': 2009,
+        'longest_streak': {'start': 2004, 'end': 2006, 'length': 3}, 'longest_gap_years': 2
+    }], f"Unexpected streaks: {streaks}"
+    
+    print("✅ Match analytics test passed")
+
+def test_report_rendering():
+    """Test multi-format rendering from one report model and the section cache"""
+    print("🧪 Testing report rendering...")
+    
+    verifier = CenaMatchVerifier(use_mock_data=True)
+    verifier.existing_matches = verifier.extract_existing_matches("index.html")
+    verifier.scraped_matches = verifier.scrape_profightdb_matches()
+    comparison = verifier.compare_matches()
+    model = verifier.build_report_model(comparison)
+    
+    markdown = verifier.render_report(model, 'markdown')
+    assert markdown.startswith("# John Cena PPV Match Verification Report")
+    
+    data = json.loads(verifier.render_report(model, 'json'))
+    assert data['summary']['matched_count'] == len(comparison['matched'])
+    assert data['only_in_scraped'] == [m.to_dict() for m in comparison['only_in_scraped']]
+    
+    rows = verifier.render_report(model, 'csv').splitlines()
+    assert rows[0] == "result,year,type,date,event,opponent"
+    assert len(rows) == 1 + sum(len(matches) for matches in comparison.values())
+    
+    page = verifier.render_report(model, 'html')
+    assert page.startswith("<!DOCTYPE html>") and page.rstrip().endswith("</html>")
+    assert "<td>New Year&#x27;s Revolution</td>" in page, "Match text should be escaped"
+    assert "<h2>Recommendations</h2>" in page and "<h2>For Production Use</h2>" in page
+    
+    # Rendering the same model again reuses every section
+    cache = RenderCache(dict(verifier.render_cache.entries))
+    assert render_report(model, 'markdown', cache) == markdown
+    assert cache.misses == 0 and cache.hits == len(model)
+    
+    # A new scraped match only re-renders the sections whose input changed
+    verifier.scraped_matches.append(Match(2025, "PPV", "2025-04-19", "WrestleMania 41", "Cody Rhodes"))
+    comparison = verifier.compare_matches()
+    cache = RenderCache(dict(verifier.render_cache.entries))
+    render_report(verifier.build_report_model(comparison), 'markdown', cache)
+    assert cache.misses == 4, "Only header, summary, only-in-scraped and recommendations should change"
+    
+    # Sections a run did not render are evicted from the snapshot store on save
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        snapshot_path = os.path.join(tmp_dir, "snapshots.json")
+        for scraped in (verifier.scraped_matches[:-1], verifier.scraped_matches):
+            cached = CenaMatchVerifier(use_mock_data=True, snapshot_path=snapshot_path)
+            cached.existing_matches = verifier.existing_matches
+            cached.scraped_matches = scraped
+            model = cached.build_report_model(cached.compare_matches())
+            cached.render_report(model, 'markdown')
+            cached.snapshots.save()
+        assert len(SnapshotStore(snapshot_path).rendered_sections) == len(model)
+    
+    print("✅ Report rendering test passed")
+
+def test_out_of_core_verification():
+    """Test that the out-of-core join writes the same reports as an in-memory run"""
+    print("🧪 Testing out-of-core verification...")
+    
+    verifier = CenaMatchVerifier(use_mock_data=True, report_formats=['markdown', 'json', 'csv'])
+    verifier.existing_matches = verifier.extract_existing_matches("index.html")
+    verifier.scraped_matches = verifier.scrape_profightdb_matches()
+    model = verifier.build_report_model(verifier.compare_matches())
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        external = CenaMatchVerifier(use_mock_data=True, report_formats=['markdown', 'json', 'csv'])
+        # Small runs and fan-in force several merge passes
+        counts = run_out_of_core_verification(external, "index.html", run_size=25, work_dir=tmp_dir, output_dir=tmp_dir,
+                                              fan_in=4)
+        assert counts == {name: section.data['count'] for name, section in model.items() if 'count' in section.data}
+        assert not [name for name in os.listdir(tmp_dir) if name.startswith("cenalist-runs-")], \
+            "Sorted runs should be removed after the join"
+        
+        strip_time = lambda text: [line for line in text.splitlines() if "Generated on" not in line and '"timestamp"' not in line]
+        for format_name, output_file in [('markdown', "cena_match_verification_report.md"),
+                                         ('json', "cena_match_comparison_data.json"),
+                                         ('csv', "cena_match_verification_report.csv")]:
+            with open(os.path.join(tmp_dir, output_file), 'r', encoding='utf-8') as f:
+                streamed = f.read()
+            rendered = verifier.render_report(model, format_name)
+            assert strip_time(streamed) == strip_time(rendered), f"Out-of-core {format_name} output differs"
+    
+    # Merging more runs than the fan-in takes extra passes and leaves only the original runs behind
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        runs, count = spill_sorted_runs(verifier.existing_matches, tmp_dir, "runs", EXISTING_ORDER, run_size=10)
+        merged = list(merge_runs(runs, EXISTING_ORDER, fan_in=2))
+        assert len(merged) == count and merged == sorted(merged, key=EXISTING_ORDER)
+        assert sorted(os.listdir(tmp_dir)) == sorted(os.path.basename(path) for path in runs)
+    
+    # Both sides merge at once, so each needs at least two runs of the fan-in
+    try:
+        run_out_of_core_verification(CenaMatchVerifier(use_mock_data=True), "index.html", fan_in=3)
+        assert False, "A fan-in below 4 should be rejected"
+    except ValueError:
+        pass
+    
+    with_window = CenaMatchVerifier(use_mock_data=True, date_window_days=3)
+    try:
+        run_out_of_core_verification(with_window, "index.html")
+        assert False, "Date windows should be rejected"
+    except ValueError:
+        pass
+    
+    print("✅ Out-of-core verification test passed")
+
 def main():
     """Run all tests"""
     print("🚀 Running John Cena Match Verification Tests")
@@ -124,10 +750,22 @@ def main():
     try:
         # Run tests
         test_match_extraction()
+        test_match_extraction_without_dataset()
         test_fuzzy_matching()
         test_mock_data_verification()
         test_report_generation()
         test_json_export()
+        test_batch_verification()
+        test_opponent_index()
+        test_date_window_matching()
+        test_resilient_fetching()
+        test_source_adapters()
+        test_change_detection_snapshots()
+        test_worker_dataset_export()
+        test_sharded_build()
+        test_match_analytics()
+        test_report_rendering()
+        test_out_of_core_verification()
         
         print("")
         print("=" * 60)
@@ -7,15 +7,32 @@ existing data with scraped data. Since ProFightDB is not accessible in this
 environment, it includes mock data for demonstration purposes.
 """
 
+import os
 import re
+import sys
+import csv
+import glob
 import json
+import mmap
+import bisect
+import time
+import base64
+import hashlib
+import unicodedata
 import requests
+from array import array
 from bs4 import BeautifulSoup
-from typing import List, Dict, Optional, Tuple
-from datetime import datetime
-from dataclasses import dataclass
+from typing import Callable, Deque, Iterable, Iterator, List, Dict, Optional, Set, Tuple
+from datetime import date, datetime
+from dataclasses import dataclass, field
+from urllib.parse import urlparse
+from functools import lru_cache, partial
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dateutil import parser
 
+from match_reports import BATCH_REPORT_FORMATS, REPORT_FORMATS, RenderCache, ReportSection, render_report
+
 
 @dataclass
 class Match:
@@ -49,16 +66,831 @@ class Match:
             'event': self.event,
             'opponent': self.opponent
         }
+    
+    @property
+    def opponents(self) -> List[str]:
+        """Canonical wrestler entities parsed from the opponent field."""
+        return extract_opponent_entities(self.opponent)
+
+
+# Alternate spellings and ring names, keyed by normalized name
+OPPONENT_ALIASES = {
+    'john bradshaw layfield': 'JBL',
+    'bradshaw': 'JBL',
+    'jesus': 'Jesús',
+    'rene dupree': 'René Duprée',
+    'the big show': 'Big Show',
+    'carlito caribbean cool': 'Carlito',
+    'the fiend bray wyatt': 'Bray Wyatt',
+    'the fiend': 'Bray Wyatt',
+    'dx': 'D-Generation X',
+    'rated rko': 'Rated-RKO',
+}
+
+# Opponent-field fragments that describe a match rather than a wrestler
+NON_ENTITY_PATTERN = re.compile(r'\b(match|challenge|participated|competed|returned)\b|^team\b', re.I)
+
+
+def normalize_wrestler_name(name: str) -> str:
+    """Normalize a wrestler name for alias lookups (case, accents, quotes, punctuation)."""
+    folded = unicodedata.normalize('NFKD', name)
+    folded = ''.join(c for c in folded if not unicodedata.combining(c))
+    folded = re.sub(r"[^\w\s]", ' ', folded.lower())
+    return ' '.join(folded.split())
+
+
+def resolve_wrestler_alias(name: str) -> str:
+    """Resolve a wrestler name to its canonical form through the alias table."""
+    name = ' '.join(name.split())
+    return OPPONENT_ALIASES.get(normalize_wrestler_name(name), name)
+
+
+def extract_opponent_entities(opponent_text: str) -> List[str]:
+    """Tokenize a free-text opponent field into canonical wrestler entities.
+    
+    Tag partners ("Teamed with X vs. ...") and match descriptions are skipped,
+    stipulations in parentheses are dropped, and stable member lists such as
+    "The Bloodline (Solo Sikoa & Jimmy Uso)" contribute each member.
+    """
+    entities = []
+    
+    for clause in opponent_text.split(';'):
+        # Parenthesised member lists name wrestlers; anything else is a stipulation
+        members = [m for m in re.findall(r'\(([^)]*)\)', clause) if re.search(r'&|,', m)]
+        clause = re.sub(r'\([^)]*\)', '', clause)
+        
+        segments = re.split(r'\bvs\.?\s', clause, flags=re.I)
+        for index, segment in enumerate(segments + members):
+            segment = segment.strip()
+            if not segment or segment.lower().startswith('teamed with'):
+                continue
+            if index == 0 and len(segments) > 1 and re.match(r'(cashed in|then)\b', segment, re.I):
+                continue
+            for name in re.split(r',|&|\band\b', segment):
+                name = name.strip(" '\"")
+                if name and not NON_ENTITY_PATTERN.search(name):
+                    entity = resolve_wrestler_alias(name)
+                    if entity not in entities:
+                        entities.append(entity)
+    
+    return entities
+
+
+class OpponentIndex:
+    """Inverted index from canonical wrestler names to match ids (list positions)."""
+    
+    def __init__(self, matches: Optional[List[Match]] = None):
+        self.postings: Dict[str, List[int]] = {}
+        self.size = 0
+        for match in matches or []:
+            self.add(match)
+    
+    def add(self, match: Match) -> int:
+        """Index a match and return its id."""
+        match_id = self.size
+        self.size += 1
+        for entity in match.opponents:
+            self.postings.setdefault(normalize_wrestler_name(entity), []).append(match_id)
+        return match_id
+    
+    def lookup(self, wrestler: str) -> List[int]:
+        """Return the ids of every match against the given wrestler or any of its aliases."""
+        return self.postings.get(normalize_wrestler_name(resolve_wrestler_alias(wrestler)), [])
+
+
+# Start of the embedded dataset and the shape of each record within it
+ALL_MATCHES_MARKER = b'const allMatches = ['
+MATCH_RECORD_PATTERN = re.compile(
+    rb'\{\s*year:\s*(\d+),\s*type:\s*"([^"]*)",\s*date:\s*"([^"]*)",\s*event:\s*"([^"]*)",\s*opponent:\s*"([^"]*)"[^}]*\}'
+)
+
+ISO_DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}')
+# Distinct non-ISO date strings whose parse is kept; an archive rarely has more
+DATE_CACHE_SIZE = 4096
+
+
+def parse_date_ordinal(date_text: str) -> Optional[int]:
+    """Return the proleptic ordinal of a YYYY-MM-DD date, or None if it isn't one."""
+    if not ISO_DATE_PATTERN.fullmatch(date_text):
+        return None
+    try:
+        return date.fromisoformat(date_text).toordinal()
+    except ValueError:
+        return None
+
+
+class DateIndex:
+    """Matches ordered by date once, with bisect-based window lookups.
+    
+    `order` lists match ids in the same order as sorting by the date string, so
+    reports can reuse it directly. ISO dates sort lexically in calendar order,
+    which keeps the parallel `ordinals` array sorted for bisection; matches
+    whose date is not ISO formatted are kept in `undated` instead.
+    """
+    
+    def __init__(self, matches: List[Match]):
+        self.matches = matches
+        self.order = sorted(range(len(matches)), key=lambda i: matches[i].date)
+        self.ordinals: List[int] = []
+        self.dated_ids: List[int] = []
+        self.undated: List[int] = []
+        for match_id in self.order:
+            ordinal = parse_date_ordinal(matches[match_id].date)
+            if ordinal is None:
+                self.undated.append(match_id)
+            else:
+                self.ordinals.append(ordinal)
+                self.dated_ids.append(match_id)
+    
+    def within(self, ordinal: int, days: int) -> List[int]:
+        """Return ids of dated matches within ±days of the given ordinal, in date order."""
+        lo = bisect.bisect_left(self.ordinals, ordinal - days)
+        hi = bisect.bisect_right(self.ordinals, ordinal + days)
+        return self.dated_ids[lo:hi]
+    
+    def sorted_matches(self) -> List[Match]:
+        """Return the matches in date order."""
+        return [self.matches[i] for i in self.order]
+
+
+class CandidatePool:
+    """Scraped matches as candidates for existing matches, tracking which are still unmatched.
+    
+    Candidates share the existing match's year or, with a date window, fall
+    within ±window days (undated matches fall back to the year), and are tried
+    in scraped order. The first fuzzy match is remembered per event and
+    candidate set, so a repeated event is not compared with every candidate
+    again. Consuming a match removes the first unmatched scraped match equal to
+    it, as list.remove did, in constant time.
+    """
+    
+    def __init__(self, matches: List[Match], date_window_days: Optional[int] = None):
+        self.matches = matches
+        self.date_window_days = date_window_days
+        self.dates = DateIndex(matches)
+        self.by_year: Dict[int, List[int]] = {}
+        for match_id, match in enumerate(matches):
+            self.by_year.setdefault(match.year, []).append(match_id)
+        # Positions in date order of the unmatched matches equal to each match
+        self.unmatched: Dict[Match, Deque[int]] = {}
+        for position, match_id in enumerate(self.dates.order):
+            self.unmatched.setdefault(matches[match_id], deque()).append(position)
+        self.removed = [False] * len(matches)
+        self._first_matches: Dict[Tuple[int, Optional[int], str], Optional[int]] = {}
+    
+    def candidates(self, year: int, ordinal: Optional[int]) -> List[int]:
+        """Return candidate ids, in scraped order, for a match of this year and date ordinal."""
+        if ordinal is None:
+            return self.by_year.get(year, [])
+        return sorted(self.dates.within(ordinal, self.date_window_days) + [
+            i for i in self.dates.undated if self.matches[i].year == year
+        ])
+    
+    def first_match(self, existing_match: Match, fuzzy_match: Callable[[str, str], bool]) -> Optional[int]:
+        """Return the id of the first candidate whose event fuzzy-matches, or None."""
+        ordinal = parse_date_ordinal(existing_match.date) if self.date_window_days is not None else None
+        key = (existing_match.year, ordinal, existing_match.event)
+        if key not in self._first_matches:
+            self._first_matches[key] = next((
+                candidate_id for candidate_id in self.candidates(existing_match.year, ordinal)
+                if fuzzy_match(existing_match.event, self.matches[candidate_id].event)
+            ), None)
+        return self._first_matches[key]
+    
+    def consume(self, match_id: int) -> None:
+        """Mark the first unmatched match equal to this one as matched."""
+        positions = self.unmatched.get(self.matches[match_id])
+        if positions:
+            self.removed[positions.popleft()] = True
+    
+    def remaining(self) -> List[Match]:
+        """Return the unmatched matches in date order."""
+        return [self.matches[match_id] for position, match_id in enumerate(self.dates.order)
+                if not self.removed[position]]
+
+
+@dataclass
+class FetchResult:
+    """Outcome of fetching one page, including how it failed if it did."""
+    url: str
+    status: str  # ok, http_error, network_error, circuit_open, deadline_exceeded, parse_error
+    attempts: int = 0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+    match_count: int = 0
+    unchanged: bool = False
+    content: bytes = field(default=b'', repr=False)
+    
+    @property
+    def ok(self) -> bool:
+        return self.status == 'ok'
+    
+    def to_dict(self):
+        """Convert the page status to a dictionary for JSON serialization."""
+        return {
+            'url': self.url,
+            'status': self.status,
+            'attempts': self.attempts,
+            'elapsed': round(self.elapsed, 3),
+            'error': self.error,
+            'match_count': self.match_count,
+            'unchanged': self.unchanged
+        }
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker: opens after repeated failures, retries after a cooldown."""
+    
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 60.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.failures: Dict[str, int] = {}
+        self.opened_at: Dict[str, float] = {}
+    
+    def allow(self, host: str) -> bool:
+        """Return False while the host's circuit is open."""
+        opened_at = self.opened_at.get(host)
+        if opened_at is None:
+            return True
+        if self.clock() - opened_at >= self.cooldown:
+            # Half-open: let one request through to probe the host
+            del self.opened_at[host]
+            self.failures[host] = self.failure_threshold - 1
+            return True
+        return False
+    
+    def record_success(self, host: str) -> None:
+        self.failures.pop(host, None)
+        self.opened_at.pop(host, None)
+    
+    def record_failure(self, host: str) -> None:
+        self.failures[host] = self.failures.get(host, 0) + 1
+        if self.failures[host] >= self.failure_threshold:
+            self.opened_at[host] = self.clock()
+
+
+class ResilientFetcher:
+    """HTTP fetcher with bounded exponential backoff, circuit breaking and a deadline.
+    
+    Only network errors and retryable HTTP statuses count as host failures for
+    the circuit breaker; a 404 means the host is up. `request_timeout` is the
+    requests connect/read timeout, which limits each socket read rather than
+    the whole response, so bodies are streamed and abandoned once the deadline
+    passes.
+    """
+    
+    RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+    CHUNK_SIZE = 64 * 1024
+    
+    def __init__(self, session=None, max_attempts: int = 4, backoff_base: float = 1.0,
+                 backoff_max: float = 8.0, request_timeout: float = 10.0,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.session = session or requests.Session()
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.request_timeout = request_timeout
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(clock=clock)
+        self.clock = clock
+        self.sleep = sleep
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        }
+    
+    def fetch(self, url: str, deadline: Optional[float] = None) -> FetchResult:
+        """Fetch a page, retrying transient failures until it succeeds or the deadline passes.
+        
+        `deadline` is an absolute `clock()` value shared by every page of a run.
+        """
+        host = urlparse(url).netloc
+        started = self.clock()
+        result = FetchResult(url=url, status='network_error')
+        
+        for attempt in range(1, self.max_attempts + 1):
+            if not self.circuit_breaker.allow(host):
+                result.status = 'circuit_open'
+                result.error = result.error or f"Circuit open for {host}"
+                break
+            
+            timeout = self.request_timeout
+            if deadline is not None:
+                timeout = min(timeout, deadline - self.clock())
+                if timeout <= 0:
+                    result.status = 'deadline_exceeded'
+                    result.error = result.error or "Deadline exceeded before the first attempt"
+                    break
+            
+            result.attempts = attempt
+            retryable = True
+            try:
+                response = self.session.get(url, headers=self.headers, timeout=timeout, stream=True)
+                try:
+                    if response.status_code >= 400:
+                        retryable = response.status_code in self.RETRYABLE_STATUS_CODES
+                        result.status = 'http_error'
+                        result.error = f"HTTP {response.status_code}"
+                    else:
+                        content = self._read_body(response, deadline)
+                        if content is None:
+                            result.status = 'deadline_exceeded'
+                            result.error = "Deadline exceeded while reading the response"
+                            break
+                        self.circuit_breaker.record_success(host)
+                        result.status = 'ok'
+                        result.error = None
+                        result.content = content
+                        break
+                finally:
+                    response.close()
+            except requests.RequestException as e:
+                result.status = 'network_error'
+                result.error = str(e)
+            
+            if not retryable:
+                break
+            self.circuit_breaker.record_failure(host)
+            if attempt == self.max_attempts:
+                break
+            
+            delay = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+            if deadline is not None and self.clock() + delay >= deadline:
+                result.status = 'deadline_exceeded'
+                result.error = f"Deadline exceeded after {result.error}"
+                break
+            self.sleep(delay)
+        
+        result.elapsed = self.clock() - started
+        return result
+    
+    def _read_body(self, response, deadline: Optional[float]) -> Optional[bytes]:
+        """Read a streamed body, or return None once the deadline has passed."""
+        chunks = []
+        for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+            chunks.append(chunk)
+            if deadline is not None and self.clock() >= deadline:
+                return None
+        return b''.join(chunks)
+
+
+def parse_match_date(date_text: str) -> Optional[Tuple[int, str]]:
+    """Parse a source date into (year, YYYY-MM-DD), keeping the raw text if only a year is found.
+    
+    ISO dates skip dateutil entirely; other formats go through a bounded cache
+    since sources repeat dates.
+    """
+    if ISO_DATE_PATTERN.fullmatch(date_text):
+        return int(date_text[:4]), date_text
+    return _parse_loose_date(date_text)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_loose_date(date_text: str) -> Optional[Tuple[int, str]]:
+    """Parse a non-ISO date with dateutil, falling back to the first 4-digit year."""
+    try:
+        parsed_date = parser.parse(date_text)
+        return parsed_date.year, parsed_date.strftime("%Y-%m-%d")
+    except (ValueError, OverflowError):
+        # Try to extract year from text
+        year_match = re.search(r'(\d{4})', date_text)
+        if year_match:
+            return int(year_match.group(1)), date_text
+        return None
+
+
+def normalize_rows(rows: List[Dict[str, str]], default_type: str = "PPV") -> List[Match]:
+    """Normalize a batch of raw source rows into Match objects.
+    
+    Rows need `date`, `event` and `opponent` keys and may carry a `type`.
+    Rows without a date or event, or whose date has no year, are dropped.
+    """
+    matches = []
+    for row in rows:
+        date_text = (row.get('date') or '').strip()
+        event_text = (row.get('event') or '').strip()
+        if not date_text or not event_text:
+            continue
+        
+        parsed = parse_match_date(date_text)
+        if parsed is None:
+            continue
+        
+        year, formatted_date = parsed
+        matches.append(Match(
+            year=year,
+            type=(row.get('type') or default_type).strip(),
+            date=formatted_date,
+            event=event_text,
+            opponent=(row.get('opponent') or '').strip()
+        ))
+    return matches
+
+
+class SourceAdapter:
+    """A source of raw match rows feeding the shared normalization pipeline.
+    
+    Adapters only turn their source into batches of raw row dicts; date
+    parsing, normalization and matching are shared by every source.
+    """
+    
+    name = "source"
+    default_type = "PPV"
+    
+    def __init__(self):
+        self.page_status: List[FetchResult] = []
+    
+    def iter_batches(self) -> Iterator[List[Dict[str, str]]]:
+        """Yield batches of raw rows."""
+        raise NotImplementedError
+    
+    def load(self) -> List[Match]:
+        """Run every batch through the normalization pipeline."""
+        matches = []
+        for batch in self.iter_batches():
+            matches.extend(normalize_rows(batch, default_type=self.default_type))
+        return matches
+
+
+def extract_profightdb_rows(content: bytes) -> List[Dict[str, str]]:
+    """Extract raw match rows from a ProFightDB page."""
+    soup = BeautifulSoup(content, 'html.parser')
+    
+    # Look for tables or divs containing match information
+    # The structure may vary, so we'll try multiple approaches
+    rows = []
+    for table in soup.find_all('table'):
+        for row in table.find_all('tr')[1:]:  # Skip header row
+            cells = row.find_all(['td', 'th'])
+            if len(cells) >= 3:
+                rows.append({
+                    'date': cells[0].get_text(strip=True),
+                    'event': cells[1].get_text(strip=True),
+                    'opponent': cells[2].get_text(strip=True)
+                })
+    
+    # If no usable table rows were found, look for other structures
+    if not any(row['date'] and row['event'] for row in rows):
+        rows = []
+        date_pattern = re.compile(r'(\d{1,2}[-/]\d{1,2}[-/]\d{4}|\d{4}[-/]\d{1,2}[-/]\d{1,2})')
+        for div in soup.find_all('div', class_=re.compile(r'match|event|ppv', re.I)):
+            text = div.get_text(strip=True)
+            date_match = date_pattern.search(text)
+            if not date_match:
+                continue
+            
+            # Look for "vs" or "vs." to separate event from opponent
+            remaining_text = text.replace(date_match.group(1), "").strip()
+            vs_match = re.search(r'(.*?)\s+vs\.?\s+(.*)', remaining_text, re.I)
+            if vs_match:
+                event, opponent = vs_match.group(1).strip(), vs_match.group(2).strip()
+            else:
+                event, opponent = remaining_text, "Unknown"
+            rows.append({'date': date_match.group(1), 'event': event, 'opponent': opponent})
+    
+    return rows
+
+
+class SnapshotStore:
+    """Content hashes and parse/comparison results from previous runs, kept as JSON.
+    
+    Pages whose content hash is unchanged reuse their stored rows instead of
+    being parsed again, and comparisons are stored under a key derived from
+    both datasets and the matcher version, so unchanged inputs skip matching
+    entirely. The hashes of dataset shards that were last verified are kept in
+    `verified_shards`, and rendered report sections in `rendered_sections`.
+    
+    Entries are pruned on save: in each store the run used, entries the run
+    did not touch are dropped, so the file does not grow with every run.
+    """
+    
+    VERSION = 1
+    PRUNED_STORES = ('pages', 'comparisons', 'rendered_sections')
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.pages: Dict[str, Dict] = {}
+        self.comparisons: Dict[str, Dict] = {}
+        self.verified_shards: Dict[str, str] = {}
+        self.rendered_sections: Dict[str, str] = {}
+        self.touched: Dict[str, Set[str]] = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION:
+                self.pages = data.get('pages', {})
+                self.comparisons = data.get('comparisons', {})
+                self.verified_shards = data.get('verified_shards', {})
+                self.rendered_sections = data.get('rendered_sections', {})
+    
+    def touch(self, store: str, key: str) -> None:
+        """Mark an entry as used by this run so it survives pruning."""
+        self.touched.setdefault(store, set()).add(key)
+    
+    def cached_rows(self, url: str, content_hash: str) -> Optional[List[Dict[str, str]]]:
+        """Return the rows parsed from this page last time if its content is unchanged."""
+        self.touch('pages', url)
+        snapshot = self.pages.get(url)
+        if snapshot and snapshot['content_hash'] == content_hash:
+            return snapshot['rows']
+        return None
+    
+    def store_rows(self, url: str, content_hash: str, rows: List[Dict[str, str]]) -> None:
+        self.touch('pages', url)
+        self.pages[url] = {'content_hash': content_hash, 'rows': rows}
+    
+    def cached_comparison(self, key: str) -> Optional[Dict[str, List[Match]]]:
+        self.touch('comparisons', key)
+        snapshot = self.comparisons.get(key)
+        if snapshot is None:
+            return None
+        return {name: [Match(**m) for m in matches] for name, matches in snapshot.items()}
+    
+    def store_comparison(self, key: str, comparison: Dict[str, List[Match]]) -> None:
+        self.touch('comparisons', key)
+        self.comparisons[key] = {name: [m.to_dict() for m in matches] for name, matches in comparison.items()}
+    
+    def prune(self) -> None:
+        """Drop entries this run did not touch from every store it used."""
+        for store in self.PRUNED_STORES:
+            touched = self.touched.get(store)
+            if touched:
+                entries = getattr(self, store)
+                for key in [key for key in entries if key not in touched]:
+                    del entries[key]
+    
+    def save(self) -> None:
+        self.prune()
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'pages': self.pages, 'comparisons': self.comparisons,
+                       'verified_shards': self.verified_shards, 'rendered_sections': self.rendered_sections},
+                      f, indent=2, ensure_ascii=False)
+        print(f"💾 Snapshots saved to: {self.path}")
+
+
+class ProFightDBSource(SourceAdapter):
+    """ProFightDB HTML pages, fetched resiliently within one shared deadline."""
+    
+    name = "ProFightDB"
+    
+    def __init__(self, urls: List[str], fetcher: ResilientFetcher, deadline_seconds: float = 60.0,
+                 snapshots: Optional[SnapshotStore] = None):
+        super().__init__()
+        self.urls = urls
+        self.fetcher = fetcher
+        self.deadline_seconds = deadline_seconds
+        self.snapshots = snapshots
+    
+    def iter_batches(self) -> Iterator[List[Dict[str, str]]]:
+        deadline = self.fetcher.clock() + self.deadline_seconds
+        for url in self.urls:
+            # Keep the stored rows of pages that fail this time for the next run
+            if self.snapshots:
+                self.snapshots.touch('pages', url)
+            result = self.fetcher.fetch(url, deadline=deadline)
+            rows = []
+            if result.ok:
+                content_hash = hashlib.sha256(result.content).hexdigest()
+                cached = self.snapshots.cached_rows(url, content_hash) if self.snapshots else None
+                if cached is not None:
+                    rows = cached
+                    result.unchanged = True
+                else:
+                    try:
+                        rows = extract_profightdb_rows(result.content)
+                        if self.snapshots:
+                            self.snapshots.store_rows(url, content_hash, rows)
+                    except Exception as e:
+                        result.status = 'parse_error'
+                        result.error = str(e)
+                result.match_count = len(rows)
+            result.content = b''
+            self.page_status.append(result)
+            
+            icon = "♻️ " if result.unchanged else ("✅" if result.ok else "❌")
+            detail = f"{result.match_count} matches" if result.ok else result.error
+            if result.unchanged:
+                detail += ", unchanged since last run"
+            print(f"{icon} {url}: {result.status} after {result.attempts} attempt(s) ({detail})")
+            if rows:
+                yield rows
+
+
+class FileDumpSource(SourceAdapter):
+    """Local CSV, JSON or JSON Lines dump of match rows.
+    
+    JSON may be a list of row objects or an object with a `matches` list.
+    CSV and JSON Lines (`.jsonl`, one row object per line) are read row by row.
+    """
+    
+    def __init__(self, path: str, batch_size: int = 1000):
+        super().__init__()
+        self.path = path
+        self.name = path
+        self.batch_size = batch_size
+    
+    def _iter_rows(self) -> Iterator[Dict[str, str]]:
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            if self.path.lower().endswith('.csv'):
+                yield from csv.DictReader(f)
+                return
+            if self.path.lower().endswith('.jsonl'):
+                yield from (json.loads(line) for line in f if line.strip())
+                return
+            data = json.load(f)
+        yield from (data.get('matches', []) if isinstance(data, dict) else data)
+    
+    def iter_batches(self) -> Iterator[List[Dict[str, str]]]:
+        batch = []
+        for row in self._iter_rows():
+            batch.append({key: str(value) for key, value in row.items() if value is not None})
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+class MockSource(SourceAdapter):
+    """Generated mock rows for demonstrations and tests."""
+    
+    name = "Mock data"
+    
+    def __init__(self, generate: Callable[[], List[Match]]):
+        super().__init__()
+        self.generate = generate
+    
+    def iter_batches(self) -> Iterator[List[Dict[str, str]]]:
+        yield [match.to_dict() for match in self.generate()]
+
+
+def _unsigned_typecode(itemsize: int) -> str:
+    """Return the unsigned array typecode that is exactly `itemsize` bytes on this platform."""
+    for typecode in 'BHILQ':
+        if array(typecode).itemsize == itemsize:
+            return typecode
+    raise ValueError(f"No {itemsize}-byte unsigned array typecode on this platform")
+
+
+def _encode_column(values: List[int], itemsize: int) -> str:
+    """Pack integers into a little-endian typed-array buffer of `itemsize`-byte elements, base64 encoded.
+    
+    C type sizes vary by platform, so the typecode is chosen by size to keep
+    the buffer aligned with the Uint8/16/32Array the page decodes it as.
+    """
+    column = array(_unsigned_typecode(itemsize), values)
+    if sys.byteorder != 'little':
+        column.byteswap()
+    return base64.b64encode(column.tobytes()).decode('ascii')
+
+
+def dataset_fingerprint(matches: List[Match]) -> str:
+    """Return the FNV-1a hash index.html computes over its embedded dataset.
+    
+    The hash runs over the UTF-16 code units of one tab-separated line per
+    match, so the page can recompute it with charCodeAt and no crypto API.
+    """
+    value = 0x811c9dc5
+    for match in matches:
+        line = f"{match.year}\t{match.type}\t{match.date}\t{match.event}\t{match.opponent}\n"
+        units = line.encode('utf-16-le')
+        for i in range(0, len(units), 2):
+            value = ((value ^ (units[i] | units[i + 1] << 8)) * 0x01000193) & 0xffffffff
+    return f"{value:08x}"
+
+
+def export_worker_dataset(matches: List[Match], output_file: str = 'cena_matches_worker.json') -> None:
+    """Export matches in the columnar layout loaded by match-worker.js.
+    
+    Years are a Uint16Array, types a Uint8Array of codes into `types`, and
+    date/event/opponent are Uint32Array indices into one shared `strings`
+    table, so the page can filter on typed arrays without parsing objects.
+    `fingerprint` lets the page ignore an export of a different dataset.
+    """
+    types: List[str] = []
+    strings: List[str] = []
+    type_codes: Dict[str, int] = {}
+    string_ids: Dict[str, int] = {}
+    
+    def intern(value: str) -> int:
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+    
+    for match in matches:
+        if match.type not in type_codes:
+            type_codes[match.type] = len(types)
+            types.append(match.type)
+    if len(types) > 256:
+        raise ValueError("Too many match types for a Uint8Array type column")
+    
+    data = {
+        'format': 'cenalist-columns',
+        'version': 1,
+        'count': len(matches),
+        'fingerprint': dataset_fingerprint(matches),
+        'types': types,
+        'strings': strings,
+        'columns': {
+            'year': {'dtype': 'uint16', 'data': _encode_column([m.year for m in matches], 2)},
+            'type': {'dtype': 'uint8', 'data': _encode_column([type_codes[m.type] for m in matches], 1)},
+            'date': {'dtype': 'uint32', 'data': _encode_column([intern(m.date) for m in matches], 4)},
+            'event': {'dtype': 'uint32', 'data': _encode_column([intern(m.event) for m in matches], 4)},
+            'opponent': {'dtype': 'uint32', 'data': _encode_column([intern(m.opponent) for m in matches], 4)}
+        }
+    }
+    
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    
+    print(f"💾 Worker dataset ({len(matches)} matches) saved to: {output_file}")
+
+
+def expand_html_inputs(patterns: List[str]) -> List[str]:
+    """Expand globs and directories into a de-duplicated list of HTML data pages."""
+    paths = []
+    seen = set()
+    
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            candidates = glob.glob(os.path.join(pattern, '*.html'))
+        else:
+            candidates = glob.glob(pattern, recursive=True)
+        
+        for candidate in sorted(candidates):
+            real_path = os.path.realpath(candidate)
+            if os.path.isfile(candidate) and real_path not in seen:
+                seen.add(real_path)
+                paths.append(candidate)
+    
+    return paths
+
+
+def dataset_hash(matches: List[Match]) -> str:
+    """Return a content hash identifying an extracted dataset."""
+    digest = hashlib.sha256()
+    for match in matches:
+        digest.update(json.dumps(match.to_dict(), sort_keys=True, ensure_ascii=False).encode('utf-8'))
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+
+def _extract_html_file(html_file_path: str) -> Tuple[str, List[Match], Optional[str], Optional[str]]:
+    """Extract a single data page; used as the batch worker entry point.
+    
+    Returns (path, matches, dataset hash, error). A page that cannot be read
+    or has no match data comes back with its error instead of raising, so one
+    bad page does not abort the batch.
+    """
+    try:
+        matches = CenaMatchVerifier().extract_existing_matches(html_file_path)
+    except (OSError, ValueError) as e:
+        return html_file_path, [], None, str(e)
+    return html_file_path, matches, dataset_hash(matches), None
+
+
+REPORT_FILES = {
+    'markdown': 'cena_match_verification_report.md',
+    'json': 'cena_match_comparison_data.json',
+    'csv': 'cena_match_verification_report.csv',
+    'html': 'cena_match_verification_report.html'
+}
 
 
 class CenaMatchVerifier:
     """Handles verification of John Cena's match data."""
     
-    def __init__(self, use_mock_data=False):
+    # Part of the stored comparison key; bump when the matching rules, the
+    # event normalization or OPPONENT_ALIASES change so old results are not reused
+    MATCHER_VERSION = 2
+    
+    def __init__(self, use_mock_data=False, date_window_days: Optional[int] = None,
+                 fallback_to_mock: bool = False, fetch_deadline: float = 60.0,
+                 fetcher: Optional[ResilientFetcher] = None, source_path: Optional[str] = None,
+                 snapshot_path: Optional[str] = None, report_formats: Optional[List[str]] = None):
         self.profightdb_url = "http://www.profightdb.com/wrestler-ppv/john-cena-350.html"
+        self.profightdb_pages = [self.profightdb_url]
         self.existing_matches = []
         self.scraped_matches = []
+        self.page_status: List[FetchResult] = []
         self.use_mock_data = use_mock_data
+        self.fallback_to_mock = fallback_to_mock
+        self.fetch_deadline = fetch_deadline
+        self.fetcher = fetcher or ResilientFetcher()
+        self.source_path = source_path
+        self.source_name = "ProFightDB"
+        self.snapshots = SnapshotStore(snapshot_path) if snapshot_path else None
+        self.reused_comparisons = 0
+        self.report_formats = report_formats or ['markdown', 'json']
+        if self.snapshots is not None:
+            self.render_cache = RenderCache(self.snapshots.rendered_sections,
+                                            touch=partial(self.snapshots.touch, 'rendered_sections'))
+        else:
+            self.render_cache = RenderCache()
+        self.date_window_days = date_window_days
+        self._opponent_index = None
+        self._opponent_index_source = None
         
     def get_mock_profightdb_data(self) -> List[Match]:
         """Return mock data simulating ProFightDB for demonstration purposes."""
@@ -86,180 +918,87 @@ class CenaMatchVerifier:
         return mock_matches
         
     def extract_existing_matches(self, html_file_path: str) -> List[Match]:
-        """Extract existing match data from the index.html file."""
-        print("📁 Extracting existing match data from index.html...")
-        
-        with open(html_file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-        
-        # Find the JavaScript array containing match data
-        pattern = r'const allMatches = \[(.*?)\];'
-        match = re.search(pattern, content, re.DOTALL)
-        
-        if not match:
-            raise ValueError("Could not find allMatches array in index.html")
-        
-        matches_text = match.group(1)
+        """Extract existing match data from the index.html file.
         
-        # Parse each match object
-        match_pattern = r'\{\s*year:\s*(\d+),\s*type:\s*"([^"]*)",\s*date:\s*"([^"]*)",\s*event:\s*"([^"]*)",\s*opponent:\s*"([^"]*)"[^}]*\}'
+        The file is memory-mapped and searched in place; only the captured
+        field spans of each record are decoded, so large generated pages are
+        never read or copied whole.
+        """
+        print(f"📁 Extracting existing match data from {html_file_path}...")
         
-        matches = []
-        for match_obj in re.finditer(match_pattern, matches_text):
-            year, match_type, date, event, opponent = match_obj.groups()
-            matches.append(Match(
-                year=int(year),
-                type=match_type,
-                date=date,
-                event=event,
-                opponent=opponent
-            ))
+        matches = list(self.iter_existing_matches(html_file_path))
         
         print(f"✅ Found {len(matches)} existing matches")
         return matches
     
-    def scrape_profightdb_matches(self) -> List[Match]:
-        """Scrape PPV matches from ProFightDB website or return mock data."""
+    def iter_existing_matches(self, html_file_path: str) -> Iterator[Match]:
+        """Yield the matches of a data page one at a time, in page order."""
+        with open(html_file_path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                raise ValueError(f"Could not find allMatches array in {html_file_path}")
+            
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                # Find the JavaScript array containing match data
+                start = content.find(ALL_MATCHES_MARKER)
+                end = content.find(b'];', start) if start != -1 else -1
+                
+                if end == -1:
+                    raise ValueError(f"Could not find allMatches array in {html_file_path}")
+                
+                # Parse each match object between the array brackets
+                for match_obj in MATCH_RECORD_PATTERN.finditer(content, start + len(ALL_MATCHES_MARKER), end):
+                    year, match_type, match_date, event, opponent = (
+                        field.decode('utf-8') for field in match_obj.groups()
+                    )
+                    yield Match(
+                        year=int(year),
+                        type=match_type,
+                        date=match_date,
+                        event=event,
+                        opponent=opponent
+                    )
+    
+    def build_source(self) -> SourceAdapter:
+        """Return the source adapter for this run (mock data, a local dump or ProFightDB)."""
         if self.use_mock_data:
+            return MockSource(self.get_mock_profightdb_data)
+        if self.source_path:
+            return FileDumpSource(self.source_path)
+        return ProFightDBSource(self.profightdb_pages, self.fetcher, deadline_seconds=self.fetch_deadline,
+                                snapshots=self.snapshots)
+    
+    def scrape_profightdb_matches(self) -> List[Match]:
+        """Load matches from the configured source through the shared pipeline.
+        
+        ProFightDB pages are fetched through the resilient fetcher within one
+        shared deadline. Matches from pages that succeeded are returned even
+        when others failed; the outcome of each page is kept in `page_status`.
+        """
+        source = self.build_source()
+        self.source_name = source.name
+        if isinstance(source, MockSource):
             print("🧪 Using mock data for demonstration (ProFightDB not accessible)")
-            return self.get_mock_profightdb_data()
+        elif isinstance(source, FileDumpSource):
+            print(f"📂 Loading matches from {source.path}...")
+        else:
+            print(f"🌐 Scraping PPV matches from {self.profightdb_url}...")
         
-        print(f"🌐 Scraping PPV matches from {self.profightdb_url}...")
+        matches = source.load()
+        self.page_status = source.page_status
         
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            response = requests.get(self.profightdb_url, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find the table containing match data
-            matches = []
-            
-            # Look for tables or divs containing match information
-            # The structure may vary, so we'll try multiple approaches
-            tables = soup.find_all('table')
-            
-            for table in tables:
-                rows = table.find_all('tr')
-                for row in rows[1:]:  # Skip header row
-                    cells = row.find_all(['td', 'th'])
-                    if len(cells) >= 3:
-                        # Try to extract match information
-                        match_data = self._parse_match_row(cells)
-                        if match_data:
-                            matches.append(match_data)
-            
-            # If no tables found, look for other structures
-            if not matches:
-                # Look for div elements or other containers
-                match_divs = soup.find_all('div', class_=re.compile(r'match|event|ppv', re.I))
-                for div in match_divs:
-                    match_data = self._parse_match_div(div)
-                    if match_data:
-                        matches.append(match_data)
-            
-            print(f"✅ Scraped {len(matches)} PPV matches from ProFightDB")
-            return matches
-            
-        except requests.RequestException as e:
-            print(f"❌ Error scraping ProFightDB: {e}")
-            print("🧪 Falling back to mock data for demonstration...")
+        failed = [r for r in self.page_status if not r.ok]
+        if failed and self.fallback_to_mock and not matches:
+            print("🧪 All pages failed; falling back to mock data as requested...")
             self.use_mock_data = True
-            return self.get_mock_profightdb_data()
-        except Exception as e:
-            print(f"❌ Unexpected error: {e}")
-            print("🧪 Falling back to mock data for demonstration...")
-            self.use_mock_data = True
-            return self.get_mock_profightdb_data()
-    
-    def _parse_match_row(self, cells) -> Optional[Match]:
-        """Parse a table row to extract match information."""
-        try:
-            # Common patterns for ProFightDB tables
-            # This is a best guess implementation that may need adjustment
-            # based on the actual website structure
-            
-            date_text = cells[0].get_text(strip=True) if cells else ""
-            event_text = cells[1].get_text(strip=True) if len(cells) > 1 else ""
-            opponent_text = cells[2].get_text(strip=True) if len(cells) > 2 else ""
-            
-            if not all([date_text, event_text]):
-                return None
-            
-            # Parse date
-            try:
-                parsed_date = parser.parse(date_text)
-                year = parsed_date.year
-                formatted_date = parsed_date.strftime("%Y-%m-%d")
-            except:
-                # Try to extract year from text
-                year_match = re.search(r'(\d{4})', date_text)
-                if year_match:
-                    year = int(year_match.group(1))
-                    formatted_date = date_text
-                else:
-                    return None
-            
-            return Match(
-                year=year,
-                type="PPV",  # ProFightDB page is specifically for PPV matches
-                date=formatted_date,
-                event=event_text,
-                opponent=opponent_text
-            )
-            
-        except Exception as e:
-            print(f"⚠️  Error parsing row: {e}")
-            return None
-    
-    def _parse_match_div(self, div) -> Optional[Match]:
-        """Parse a div element to extract match information."""
-        try:
-            text = div.get_text(strip=True)
-            
-            # Look for date patterns
-            date_pattern = r'(\d{1,2}[-/]\d{1,2}[-/]\d{4}|\d{4}[-/]\d{1,2}[-/]\d{1,2})'
-            date_match = re.search(date_pattern, text)
-            
-            if not date_match:
-                return None
-            
-            date_text = date_match.group(1)
-            try:
-                parsed_date = parser.parse(date_text)
-                year = parsed_date.year
-                formatted_date = parsed_date.strftime("%Y-%m-%d")
-            except:
-                return None
-            
-            # Extract event and opponent from remaining text
-            # This is a simplified approach and may need refinement
-            remaining_text = text.replace(date_text, "").strip()
-            
-            # Look for "vs" or "vs." to separate event from opponent
-            vs_match = re.search(r'(.*?)\s+vs\.?\s+(.*)', remaining_text, re.I)
-            if vs_match:
-                event = vs_match.group(1).strip()
-                opponent = vs_match.group(2).strip()
-            else:
-                event = remaining_text
-                opponent = "Unknown"
-            
-            return Match(
-                year=year,
-                type="PPV",
-                date=formatted_date,
-                event=event,
-                opponent=opponent
-            )
-            
-        except Exception as e:
-            print(f"⚠️  Error parsing div: {e}")
-            return None
+            failed_pages = self.page_status
+            matches = self.scrape_profightdb_matches()
+            self.page_status = failed_pages
+            return matches
+        
+        if failed:
+            print(f"⚠️  {len(failed)} of {len(self.page_status)} pages failed; continuing with partial results")
+        print(f"✅ Loaded {len(matches)} PPV matches from {source.name}")
+        return matches
     
     def fuzzy_match_events(self, event1: str, event2: str) -> bool:
         """Check if two event names are likely the same with fuzzy matching."""
@@ -287,140 +1026,289 @@ class CenaMatchVerifier:
         return norm1 in norm2 or norm2 in norm1
     
     def compare_matches(self) -> Dict[str, List[Match]]:
-        """Compare existing matches with scraped matches using fuzzy matching."""
+        """Compare existing matches with scraped matches using fuzzy matching.
+        
+        Candidates must share the year, or fall within ±date_window_days of the
+        existing match when a window is configured. All result lists come back
+        in date order.
+        """
         print("🔍 Comparing existing data with scraped data...")
         
-        # Filter existing matches to only PPV events
-        existing_ppv = [m for m in self.existing_matches if m.type == "PPV"]
+        comparison = self.match_datasets(self.existing_matches, self.scraped_matches)
+        
+        print(f"✅ Matched: {len(comparison['matched'])} PPV matches")
+        print(f"⚠️  Only in existing data: {len(comparison['only_in_existing'])} matches")
+        print(f"🆕 Only in scraped data: {len(comparison['only_in_scraped'])} matches")
         
-        # Perform fuzzy matching
-        matched = []
-        only_in_existing = []
-        only_in_scraped = list(self.scraped_matches)  # Start with all scraped matches
+        return comparison
+    
+    def match_datasets(self, existing_matches: List[Match], scraped_matches: List[Match]) -> Dict[str, List[Match]]:
+        """Classify existing PPV matches against scraped matches; see compare_matches."""
+        # Filter existing matches to only PPV events, in date order
+        existing_ppv = [m for m in DateIndex(existing_matches).sorted_matches() if m.type == "PPV"]
+        
+        pool = CandidatePool(scraped_matches, self.date_window_days)
+        comparison = {'matched': [], 'only_in_existing': []}
+        for name, match in self.iter_classified(existing_ppv, pool):
+            comparison[name].append(match)
+        comparison['only_in_scraped'] = pool.remaining()  # Scraped matches nothing matched
+        return comparison
+    
+    def iter_classified(self, existing_ppv: Iterable[Match], pool: CandidatePool) -> Iterator[Tuple[str, Match]]:
+        """Classify existing PPV matches one at a time, yielding (result list, match).
         
+        Matched scraped matches are consumed from the pool, so what remains in
+        it afterwards is only in the scraped data.
+        """
         for existing_match in existing_ppv:
-            found_match = False
-            for scraped_match in self.scraped_matches[:]:  # Use slice to allow modification during iteration
-                if (existing_match.year == scraped_match.year and 
-                    self.fuzzy_match_events(existing_match.event, scraped_match.event)):
-                    matched.append(existing_match)
-                    if scraped_match in only_in_scraped:
-                        only_in_scraped.remove(scraped_match)
-                    found_match = True
-                    break
-            
-            if not found_match:
-                only_in_existing.append(existing_match)
+            candidate_id = pool.first_match(existing_match, self.fuzzy_match_events)
+            if candidate_id is None:
+                yield 'only_in_existing', existing_match
+            else:
+                pool.consume(candidate_id)
+                yield 'matched', existing_match
+    
+    def compare_with_snapshots(self) -> Dict[str, List[Match]]:
+        """Compare matches, reusing the stored comparison when neither dataset changed."""
+        if self.snapshots is None:
+            return self.compare_matches()
         
-        print(f"✅ Matched: {len(matched)} PPV matches")
-        print(f"⚠️  Only in existing data: {len(only_in_existing)} matches")
-        print(f"🆕 Only in scraped data: {len(only_in_scraped)} matches")
+        key = hashlib.sha256(
+            f"{self.MATCHER_VERSION}:{dataset_hash(self.existing_matches)}:{dataset_hash(self.scraped_matches)}:"
+            f"{self.date_window_days}".encode('utf-8')
+        ).hexdigest()
+        comparison = self.snapshots.cached_comparison(key)
+        if comparison is not None:
+            print("♻️  Datasets unchanged since last run; reusing stored comparison")
+            self.reused_comparisons += 1
+            return comparison
         
-        return {
-            'matched': matched,
-            'only_in_existing': only_in_existing,
-            'only_in_scraped': only_in_scraped
+        comparison = self.compare_matches()
+        self.snapshots.store_comparison(key, comparison)
+        return comparison
+    
+    @property
+    def skipped_sources(self) -> int:
+        """Number of fetched pages whose content was unchanged and not re-parsed."""
+        return len([page for page in self.page_status if page.unchanged])
+    
+    def head_to_head(self, wrestler: str) -> List[Match]:
+        """Return every existing match against the given wrestler (alias-aware)."""
+        # Rebuild when the list is replaced or grown in place
+        if (self._opponent_index_source is not self.existing_matches
+                or self._opponent_index.size != len(self.existing_matches)):
+            self._opponent_index = OpponentIndex(self.existing_matches)
+            self._opponent_index_source = self.existing_matches
+        return [self.existing_matches[i] for i in self._opponent_index.lookup(wrestler)]
+    
+    def build_report_model(self, comparison: Dict[str, List[Match]]) -> Dict[str, ReportSection]:
+        """Build the report model every output format is rendered from."""
+        total_existing_ppv = len([m for m in self.existing_matches if m.type == "PPV"])
+        counts = {name: len(matches) for name, matches in comparison.items()}
+        sections = self.build_report_overview(total_existing_ppv, len(self.scraped_matches), counts)
+        for name, matches in comparison.items():
+            sections[name] = ReportSection(name, {'count': len(matches), 'matches': [m.to_dict() for m in matches]})
+        return sections
+    
+    def build_report_overview(self, total_existing_ppv: int, total_scraped: int,
+                              counts: Dict[str, int]) -> Dict[str, ReportSection]:
+        """Build the report sections that only need totals: everything but the match lists."""
+        summary = {
+            'total_existing_ppv': total_existing_ppv,
+            'total_scraped': total_scraped,
+            'matched_count': counts['matched'],
+            'only_in_existing_count': counts['only_in_existing'],
+            'only_in_scraped_count': counts['only_in_scraped'],
+            'accuracy_rate': (counts['matched'] / total_existing_ppv) * 100 if total_existing_ppv > 0 else None
         }
+        
+        sections = [
+            ReportSection('header', {
+                'title': "John Cena PPV Match Verification Report",
+                'timestamp': datetime.now().isoformat(),
+                'use_mock_data': self.use_mock_data
+            }),
+            ReportSection('summary', summary),
+            self.build_source_section(),
+            ReportSection('recommendations', summary)
+        ]
+        if self.use_mock_data:
+            sections.append(ReportSection('production_notes', {}))
+        
+        return {section.name: section for section in sections}
+    
+    def build_source_section(self) -> ReportSection:
+        """Build the report section describing the external source and how it was fetched."""
+        return ReportSection('source', {
+            'source': self.source_name,
+            'source_url': self.profightdb_url,
+            'use_mock_data': self.use_mock_data,
+            'pages': [page.to_dict() for page in self.page_status],
+            'snapshots': self.snapshots is not None,
+            'skipped_sources': self.skipped_sources,
+            'reused_comparisons': self.reused_comparisons
+        })
+    
+    def render_report(self, model: Dict[str, ReportSection], format_name: str) -> str:
+        """Render the report model in one format, reusing unchanged sections."""
+        return render_report(model, format_name, self.render_cache)
     
     def generate_report(self, comparison: Dict[str, List[Match]]) -> str:
         """Generate a detailed verification report."""
-        report = []
-        report.append("# John Cena PPV Match Verification Report")
-        report.append(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        if self.use_mock_data:
-            report.append("⚠️ **Note: This report uses mock data for demonstration purposes**")
-        report.append("")
+        return self.render_report(self.build_report_model(comparison), 'markdown')
+    
+    def save_reports(self, model: Dict[str, ReportSection]) -> List[str]:
+        """Write the report model in every configured format; return the files written."""
+        written = []
+        for format_name in self.report_formats:
+            output_file = REPORT_FILES[format_name]
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(self.render_report(model, format_name))
+            written.append(output_file)
+        return written
+    
+    def save_comparison_data(self, comparison: Dict[str, List[Match]]) -> None:
+        """Save comparison data as JSON for further analysis."""
+        with open(REPORT_FILES['json'], 'w', encoding='utf-8') as f:
+            f.write(self.render_report(self.build_report_model(comparison), 'json'))
         
-        # Summary
-        total_existing_ppv = len([m for m in self.existing_matches if m.type == "PPV"])
-        total_scraped = len(self.scraped_matches)
-        matched_count = len(comparison['matched'])
-        
-        report.append("## Summary")
-        report.append(f"- **Total PPV matches in existing data:** {total_existing_ppv}")
-        report.append(f"- **Total PPV matches scraped from ProFightDB:** {total_scraped}")
-        report.append(f"- **Matched matches:** {matched_count}")
-        if total_existing_ppv > 0:
-            accuracy_rate = (matched_count / total_existing_ppv) * 100
-            report.append(f"- **Accuracy rate:** {accuracy_rate:.1f}%")
-        report.append("")
-        
-        # Data source info
-        report.append("## Data Source Information")
-        report.append(f"- **ProFightDB URL:** {self.profightdb_url}")
-        report.append(f"- **Using mock data:** {'Yes' if self.use_mock_data else 'No'}")
-        report.append("")
-        
-        # Detailed findings
-        if comparison['only_in_existing']:
-            report.append("## ⚠️ Matches in existing data but NOT found on ProFightDB")
-            report.append("*These matches might be missing from ProFightDB or have different naming conventions.*")
-            report.append("")
-            for match in sorted(comparison['only_in_existing'], key=lambda x: x.date):
-                report.append(f"- **{match.date}** - {match.event} vs {match.opponent}")
-            report.append("")
-        
-        if comparison['only_in_scraped']:
-            report.append("## 🆕 Matches found on ProFightDB but NOT in existing data")
-            report.append("*These might be new matches that should be added to the existing dataset.*")
-            report.append("")
-            for match in sorted(comparison['only_in_scraped'], key=lambda x: x.date):
-                report.append(f"- **{match.date}** - {match.event} vs {match.opponent}")
-            report.append("")
-        
-        if comparison['matched']:
-            report.append("## ✅ Successfully matched PPV matches")
-            report.append(f"Found {len(comparison['matched'])} matches that appear in both datasets:")
-            report.append("")
-            for match in sorted(comparison['matched'], key=lambda x: x.date)[:10]:  # Show first 10
-                report.append(f"- **{match.date}** - {match.event} vs {match.opponent}")
-            if len(comparison['matched']) > 10:
-                report.append(f"- ... and {len(comparison['matched']) - 10} more matches")
-            report.append("")
-        
-        # Recommendations
-        report.append("## Recommendations")
-        if comparison['only_in_existing']:
-            report.append("- 🔍 **Review unmatched existing matches**: These might have different naming on ProFightDB or be missing from their database")
-        if comparison['only_in_scraped']:
-            report.append("- 📝 **Consider adding new matches**: Update the existing dataset with matches found only on ProFightDB")
-        if matched_count == total_existing_ppv:
-            report.append("- ✅ **Perfect match**: All existing PPV matches were verified against ProFightDB!")
+        print(f"💾 Detailed comparison data saved to: {REPORT_FILES['json']}")
+    
+    def verify_batch(self, html_file_paths: List[str], max_workers: Optional[int] = None) -> Dict:
+        """Verify many data pages, comparing each distinct dataset only once."""
+        print(f"📚 Extracting {len(html_file_paths)} data pages in parallel...")
+        
+        # Extract every page in parallel; the regex parsing is CPU bound
+        if len(html_file_paths) > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                extracted = list(executor.map(_extract_html_file, html_file_paths))
         else:
-            report.append(f"- 📊 **{accuracy_rate:.1f}% accuracy**: Consider investigating discrepancies for better data quality")
+            extracted = [_extract_html_file(path) for path in html_file_paths]
         
-        if self.use_mock_data:
-            report.append("")
-            report.append("## For Production Use")
-            report.append("- Ensure ProFightDB website is accessible")
-            report.append("- Review and adjust the scraping logic based on actual website structure")
-            report.append("- Implement rate limiting to be respectful to the website")
-            report.append("- Add more sophisticated fuzzy matching for event names and opponent names")
+        # Group identical datasets by content hash
+        datasets = {}
+        files = []
+        for path, matches, content_hash, error in extracted:
+            if error is not None:
+                print(f"❌ Skipping {path}: {error}")
+                files.append({'path': path, 'dataset_hash': None, 'duplicate_of': None, 'error': error})
+                continue
+            if content_hash not in datasets:
+                datasets[content_hash] = {'matches': matches, 'files': []}
+            datasets[content_hash]['files'].append(path)
+            files.append({
+                'path': path,
+                'dataset_hash': content_hash,
+                'duplicate_of': datasets[content_hash]['files'][0] if len(datasets[content_hash]['files']) > 1 else None,
+                'error': None
+            })
+        
+        print(f"🧬 Found {len(datasets)} distinct datasets across {len(files)} files")
         
-        return "\n".join(report)
+        # Fetch the external source once and share it across all inputs
+        self.scraped_matches = self.scrape_profightdb_matches()
+        
+        for content_hash, dataset in datasets.items():
+            print(f"🔁 Verifying dataset {content_hash[:12]} ({', '.join(dataset['files'])})")
+            self.existing_matches = dataset['matches']
+            dataset['comparison'] = self.compare_with_snapshots()
+        
+        return {
+            'files': files,
+            'datasets': datasets
+        }
     
-    def save_comparison_data(self, comparison: Dict[str, List[Match]]) -> None:
-        """Save comparison data as JSON for further analysis."""
-        data = {
-            'timestamp': datetime.now().isoformat(),
-            'use_mock_data': self.use_mock_data,
-            'source_url': self.profightdb_url,
-            'summary': {
-                'total_existing_ppv': len([m for m in self.existing_matches if m.type == "PPV"]),
-                'total_scraped': len(self.scraped_matches),
-                'matched_count': len(comparison['matched']),
-                'only_in_existing_count': len(comparison['only_in_existing']),
-                'only_in_scraped_count': len(comparison['only_in_scraped'])
-            },
-            'matched_matches': [m.to_dict() for m in comparison['matched']],
-            'only_in_existing': [m.to_dict() for m in comparison['only_in_existing']],
-            'only_in_scraped': [m.to_dict() for m in comparison['only_in_scraped']]
+    def build_batch_report_model(self, batch: Dict) -> Dict[str, ReportSection]:
+        """Build the batch report model, rendered by the formats in BATCH_REPORT_FORMATS."""
+        summaries = {
+            content_hash: {
+                'total_existing_ppv': len([m for m in dataset['matches'] if m.type == "PPV"]),
+                'matched_count': len(dataset['comparison']['matched']),
+                'only_in_existing_count': len(dataset['comparison']['only_in_existing']),
+                'only_in_scraped_count': len(dataset['comparison']['only_in_scraped'])
+            }
+            for content_hash, dataset in batch['datasets'].items()
         }
         
-        with open('cena_match_comparison_data.json', 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        sections = [
+            ReportSection('header', {
+                'title': "John Cena PPV Match Batch Verification Report",
+                'timestamp': datetime.now().isoformat(),
+                'use_mock_data': self.use_mock_data
+            }),
+            ReportSection('summary', {
+                'file_count': len(batch['files']),
+                'dataset_count': len(batch['datasets']),
+                'failed_count': len([entry for entry in batch['files'] if entry['error']]),
+                'total_scraped': len(self.scraped_matches)
+            }),
+            self.build_source_section(),
+            ReportSection('files', {'files': batch['files'], 'summaries': summaries}),
+            ReportSection('datasets', {
+                'summaries': summaries,
+                'datasets': {
+                    content_hash: {
+                        'files': dataset['files'],
+                        'only_in_existing': [m.to_dict() for m in dataset['comparison']['only_in_existing']],
+                        'only_in_scraped': [m.to_dict() for m in dataset['comparison']['only_in_scraped']]
+                    }
+                    for content_hash, dataset in batch['datasets'].items()
+                }
+            })
+        ]
+        return {section.name: section for section in sections}
+    
+    def generate_batch_report(self, batch: Dict) -> str:
+        """Generate a consolidated report with a per-file breakdown."""
+        return render_report(self.build_batch_report_model(batch), 'markdown', self.render_cache,
+                             formats=BATCH_REPORT_FORMATS)
+    
+    def save_batch_data(self, batch: Dict, output_file: str = 'cena_match_batch_data.json') -> None:
+        """Save consolidated batch comparison data as JSON."""
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(render_report(self.build_batch_report_model(batch), 'json', self.render_cache,
+                                  formats=BATCH_REPORT_FORMATS))
         
-        print("💾 Detailed comparison data saved to: cena_match_comparison_data.json")
+        print(f"💾 Batch comparison data saved to: {output_file}")
+    
+    def run_batch_verification(self, patterns: List[str], max_workers: Optional[int] = None) -> None:
+        """Run verification across every data page matched by the given globs or directories."""
+        print("🚀 Starting John Cena PPV Match Batch Verification")
+        print("=" * 60)
+        
+        try:
+            html_file_paths = expand_html_inputs(patterns)
+            if not html_file_paths:
+                print("❌ No HTML data pages matched the given inputs.")
+                return
+            
+            batch = self.verify_batch(html_file_paths, max_workers=max_workers)
+            
+            if not self.scraped_matches:
+                print("❌ No matches could be scraped. Verification cannot proceed.")
+                return
+            
+            report_file = "cena_match_batch_report.md"
+            with open(report_file, 'w', encoding='utf-8') as f:
+                f.write(self.generate_batch_report(batch))
+            
+            self.save_batch_data(batch)
+            if self.snapshots is not None:
+                self.snapshots.save()
+            
+            print("")
+            print("📄 Files generated:")
+            print(f"  - {report_file} (batch verification report)")
+            print("  - cena_match_batch_data.json (detailed batch data)")
+            print("")
+            print("=" * 60)
+            print("BATCH VERIFICATION COMPLETE")
+            print("=" * 60)
+            
+        except Exception as e:
+            print(f"❌ Batch verification failed: {e}")
+            import traceback
+            traceback.print_exc()
     
     def run_verification(self, html_file_path: str = "index.html") -> None:
         """Run the complete verification process."""
@@ -439,22 +1327,21 @@ class CenaMatchVerifier:
                 return
             
             # Compare matches
-            comparison = self.compare_matches()
+            comparison = self.compare_with_snapshots()
             
-            # Generate and save report
-            report = self.generate_report(comparison)
-            
-            report_file = "cena_match_verification_report.md"
-            with open(report_file, 'w', encoding='utf-8') as f:
-                f.write(report)
+            # Build the report model once and render every requested format from it
+            model = self.build_report_model(comparison)
+            written = self.save_reports(model)
+            if self.render_cache.hits:
+                print(f"♻️  Reused {self.render_cache.hits} of {self.render_cache.hits + self.render_cache.misses} rendered report sections")
             
-            # Save detailed comparison data
-            self.save_comparison_data(comparison)
+            if self.snapshots is not None:
+                self.snapshots.save()
             
             print("")
             print("📄 Files generated:")
-            print(f"  - {report_file} (verification report)")
-            print(f"  - cena_match_comparison_data.json (detailed data)")
+            for output_file in written:
+                print(f"  - {output_file}")
             print("")
             print("=" * 60)
             print("VERIFICATION COMPLETE")
@@ -472,12 +1359,35 @@ def main():
     
     parser = argparse.ArgumentParser(description='Verify John Cena PPV match data against ProFightDB')
     parser.add_argument('--mock', action='store_true', help='Use mock data for demonstration')
+    parser.add_argument('--source', metavar='PATH', help='Verify against a local CSV/JSON dump instead of ProFightDB')
+    parser.add_argument('--snapshots', metavar='PATH', help='Snapshot file used to skip re-parsing and re-matching unchanged sources')
+    parser.add_argument('--fallback-to-mock', action='store_true', help='Use mock data if every ProFightDB page fails to load')
+    parser.add_argument('--fetch-deadline', type=float, default=60.0, metavar='SECONDS', help='Overall time budget for fetching ProFightDB pages')
     parser.add_argument('--html', default='index.html', help='Path to HTML file with existing match data')
+    parser.add_argument('--batch', nargs='+', metavar='PATH', help='Globs or directories of HTML data pages to verify together')
+    parser.add_argument('--date-window', type=int, default=None, metavar='DAYS', help='Match events within ±DAYS of each other instead of requiring the same year')
+    parser.add_argument('--export-worker', metavar='PATH', help='Export the --html dataset in the columnar layout used by match-worker.js and exit')
+    parser.add_argument('--workers', type=int, default=None, help='Number of parallel extraction workers in batch mode')
+    parser.add_argument('--format', action='append', choices=sorted(REPORT_FORMATS), dest='formats',
+                        help='Report format to write (repeatable; default: markdown and json)')
     
     args = parser.parse_args()
     
-    verifier = CenaMatchVerifier(use_mock_data=args.mock)
-    verifier.run_verification(args.html)
+    verifier = CenaMatchVerifier(
+        use_mock_data=args.mock,
+        date_window_days=args.date_window,
+        fallback_to_mock=args.fallback_to_mock,
+        fetch_deadline=args.fetch_deadline,
+        source_path=args.source,
+        snapshot_path=args.snapshots,
+        report_formats=args.formats
+    )
+    if args.export_worker:
+        export_worker_dataset(verifier.extract_existing_matches(args.html), args.export_worker)
+    elif args.batch:
+        verifier.run_batch_verification(args.batch, max_workers=args.workers)
+    else:
+        verifier.run_verification(args.html)
 
 
 if __name__ == "__main__":